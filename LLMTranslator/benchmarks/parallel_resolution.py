@@ -0,0 +1,88 @@
+"""
+УСКОРЕНИЕ ПАРАЛЛЕЛЬНОГО ДВИЖКА РЕЗОЛЮЦИЙ ПО ЧИСЛУ ЯДЕР
+Задачи без достижимой цели насыщаются до лимита шагов последовательным движком
+и ParallelResolutionEngine с разным числом процессов; результаты сверяются с последовательным прогоном
+Оба движка отбирают партнеров по одному индексу (предикат, знак), поэтому ускорение — только от ядер
+
+Задачи:
+    цепочки — длинные цепочки импликаций: у выбранной клаузы мало партнеров, шаг дешевле пересылки
+    веер    — тысячи правил над одним предикатом: каждая выбранная клауза проверяется с тысячами партнеров
+
+Запуск из каталога LLMTranslator:
+    python -m benchmarks.parallel_resolution [--workers 1 2 4] [--problem веер] [--max-steps 300]
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+
+from benchmarks.resolution_strategies import STRATEGIES, chain_problem
+from modules.parallel_resolution import ParallelResolutionEngine
+from modules.resolution_engine import ResolutionEngine
+
+
+def fan_problem(facts: int, rules: int, groups: int = 50) -> list:
+    """
+    Факты R(Ci, Dj) по groups значениям j и правила ¬R(x, Dk) ∨ Sk(x) для k < rules:
+    унифицируются только правила с k < groups, остальные пары дают лишние попытки унификации
+    """
+    formulas = [f"R(C{i}, D{i % groups})" for i in range(facts)]
+    formulas += [f"¬R(x, D{k}) ∨ S{k}(x)" for k in range(rules)]
+    formulas.append("¬Недостижимо(C0)")
+    return formulas
+
+
+def build_problem(name: str) -> tuple:
+    """Формулы и лимит шагов задачи"""
+    if name == "цепочки":
+        # Цель заменена недостижимой, чтобы движок работал до лимита шагов на растущем множестве клауз
+        formulas = chain_problem(60, 40, 3, two_premise=False)[:-1]
+        return formulas + ["¬Недостижимо(C0)"], 3000
+    return fan_problem(500, 3000), 300
+
+
+def run(engine: ResolutionEngine, formulas: list) -> tuple:
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        result = engine.prove(formulas)
+        elapsed = (time.perf_counter() - started) * 1000
+    return result, elapsed
+
+
+def compare(problem: str, workers_list: list, strategy: str, max_steps: int = None):
+    formulas, default_steps = build_problem(problem)
+    options = dict(STRATEGIES[strategy], max_steps=max_steps or default_steps, verbose=False)
+
+    serial = ResolutionEngine(**options)
+    expected, serial_ms = run(serial, formulas)
+    print(f"\nЗадача «{problem}»: {len(formulas)} формул, стратегия «{strategy}», шагов: {serial.search_steps}")
+    print(f"клауз в конце: {len(serial.all_clauses)}, сгенерировано: {serial.stats['generated']}")
+    print(f"{'движок':<22} {'мс':>9} {'ускорение':>10} {'совпадает':>10}")
+    print(f"{'последовательный':<22} {serial_ms:>9.1f} {1.0:>10.2f} {'—':>10}")
+
+    for workers in workers_list:
+        with ParallelResolutionEngine(workers=workers, **options) as engine:
+            engine.start_workers()  # Запуск процессов не входит в замер
+            result, elapsed = run(engine, formulas)
+        identical = result == expected and engine.stats == serial.stats
+        print(f"{f'параллельный x{workers}':<22} {elapsed:>9.1f} {serial_ms / elapsed:>10.2f} {str(identical):>10}")
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Ускорение параллельного движка резолюций")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, cores}), help="Числа рабочих процессов")
+    parser.add_argument("--problem", choices=["цепочки", "веер"], nargs="+", default=["цепочки", "веер"])
+    parser.add_argument("--max-steps", type=int, default=None, help="Лимит шагов (по умолчанию свой у задачи)")
+    parser.add_argument("--strategy", default="базовая", choices=list(STRATEGIES))
+    args = parser.parse_args()
+
+    print(f"Ядер: {cores}")
+    for problem in args.problem:
+        compare(problem, args.workers, args.strategy, args.max_steps)
+
+
+if __name__ == "__main__":
+    main()
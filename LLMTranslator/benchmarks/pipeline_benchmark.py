@@ -0,0 +1,98 @@
+"""
+БЕНЧМАРК ПОЛНОГО КОНВЕЙЕРА: формализация -> доказательство -> объяснение
+
+Запуск из каталога LLMTranslator:
+    # 1. Записать ответы живой модели (один раз)
+    python -m benchmarks.pipeline_benchmark --backend record --record-backend ollama
+    # 2. Детерминированный прогон без модели с синтетической задержкой
+    python -m benchmarks.pipeline_benchmark --backend replay --latency 0.3 --per-token-latency 0.02
+    # 3. То же без маршрутизации объяснений (все объяснения через LLM)
+    python -m benchmarks.pipeline_benchmark --backend replay --latency 0.3 --per-token-latency 0.02 --no-routing
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+from config import LLM_BACKEND
+from benchmarks.problems import PROBLEMS
+from modules.explainer import Explainer
+from modules.explanation_router import ExplanationRouter
+from modules.formalizer import Formalizer
+from modules.llm_backends import create_backend
+from modules.resolution_engine import ResolutionEngine
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_pipeline(formalizer: Formalizer, prover: ResolutionEngine, router: ExplanationRouter, text: str) -> dict:
+    """Один прогон конвейера; возвращает длительность каждого этапа в мс"""
+    timings = {}
+
+    started = time.perf_counter()
+    formulas = formalizer.formalize(text)
+    timings["formalize"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    proved, steps = prover.prove(formulas)
+    timings["prove"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    router.explain(steps, text, proved, prover.refutation)
+    timings["explain"] = (time.perf_counter() - started) * 1000
+
+    timings["total"] = sum(timings.values())
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк полного конвейера")
+    parser.add_argument("--backend", default="replay", help="ollama | openai | record | replay")
+    parser.add_argument("--record-backend", default=LLM_BACKEND["record_backend"])
+    parser.add_argument("--replay-file", default=LLM_BACKEND["replay_file"])
+    parser.add_argument("--latency", type=float, default=LLM_BACKEND["replay_latency"])
+    parser.add_argument("--per-token-latency", type=float, default=LLM_BACKEND["replay_per_token_latency"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-routing", action="store_true", help="Объяснять все доказательства через LLM")
+    parser.add_argument("--verbose", action="store_true", help="Не скрывать вывод модулей")
+    args = parser.parse_args()
+
+    backend = create_backend({
+        "type": args.backend,
+        "record_backend": args.record_backend,
+        "replay_file": args.replay_file,
+        "replay_latency": args.latency,
+        "replay_per_token_latency": args.per_token_latency
+    })
+    runs = 1 if args.backend == "record" else args.runs
+
+    results = {}
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        formalizer = Formalizer(backend=backend)
+        # При записи объяснения всегда идут в LLM, чтобы запись годилась и для прогона без маршрутизации
+        routing = not args.no_routing and args.backend != "record"
+        router = ExplanationRouter(Explainer(backend=backend), settings={"enabled": routing})
+        prover = ResolutionEngine()
+        for _ in range(runs):
+            for problem in PROBLEMS:
+                for stage, value in run_pipeline(formalizer, prover, router, problem["text"]).items():
+                    results.setdefault(stage, []).append(value)
+
+    print(f"Бэкенд: {backend.name}, прогонов: {runs} x {len(PROBLEMS)} задач")
+    print(f"{'этап':<10} {'mean, мс':>10} {'p50, мс':>10} {'p95, мс':>10}")
+    for stage, values in results.items():
+        print(f"{stage:<10} {statistics.mean(values):>10.2f} {percentile(values, 0.5):>10.2f} "
+              f"{percentile(values, 0.95):>10.2f}")
+
+    for route, route_stats in router.stats().items():
+        print(f"объяснения {route}: {route_stats['count']}, среднее {route_stats['avg_ms']} мс")
+
+
+if __name__ == "__main__":
+    main()
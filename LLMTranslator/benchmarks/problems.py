@@ -0,0 +1,54 @@
+"""
+ФИКСИРОВАННЫЙ НАБОР ЗАДАЧ ДЛЯ БЕНЧМАРКОВ
+Для каждой задачи: текст, эталонная формализация и ожидаемый результат доказательства
+"""
+
+PROBLEMS = [
+    {
+        "text": "Сократ — человек. Все люди смертны. Докажи, что Сократ смертен.",
+        "formulas": ["Человек(Сократ)", "∀x (Человек(x) → Смертен(x))", "¬Смертен(Сократ)"],
+        "proved": True
+    },
+    {
+        "text": "Все кошки млекопитающие. Все млекопитающие позвоночные. Мурка — кошка. Докажи, что Мурка позвоночное.",
+        "formulas": ["∀x (Кошка(x) → Млекопитающее(x))", "∀x (Млекопитающее(x) → Позвоночное(x))",
+                     "Кошка(Мурка)", "¬Позвоночное(Мурка)"],
+        "proved": True
+    },
+    {
+        "text": "Все птицы летают. Пингвин — птица. Пингвин не летает. Докажи противоречие.",
+        "formulas": ["∀x (Птица(x) → Летает(x))", "Птица(Пингвин)", "¬Летает(Пингвин)"],
+        "proved": True
+    },
+    {
+        "text": "Если идет дождь, то улица мокрая. Улица мокрая. Значит, идет дождь?",
+        "formulas": ["Дождь → МокраяУлица", "МокраяУлица", "¬Дождь"],
+        "proved": False
+    },
+    {
+        "text": "Все рыбы плавают. Немо — рыба. Докажи, что Немо плавает.",
+        "formulas": ["∀x (Рыба(x) → Плавает(x))", "Рыба(Немо)", "¬Плавает(Немо)"],
+        "proved": True
+    },
+    {
+        "text": "Все студенты учатся. Все, кто учится, сдают экзамены. Иван — студент. Докажи, что Иван сдает экзамены.",
+        "formulas": ["∀x (Студент(x) → Учится(x))", "∀x (Учится(x) → СдаетЭкзамены(x))",
+                     "Студент(Иван)", "¬СдаетЭкзамены(Иван)"],
+        "proved": True
+    },
+    {
+        "text": "Барсик — кот. Барсик не кот. Докажи противоречие.",
+        "formulas": ["Кот(Барсик)", "¬Кот(Барсик)"],
+        "proved": True
+    },
+    {
+        "text": "Все металлы проводят ток. Медь — металл. Докажи, что медь проводит ток.",
+        "formulas": ["∀x (Металл(x) → ПроводитТок(x))", "Металл(Медь)", "¬ПроводитТок(Медь)"],
+        "proved": True
+    },
+]
+
+
+def normalize_formula(formula: str) -> str:
+    """Нормализация для сравнения формул: без пробелов"""
+    return "".join(formula.split())
@@ -0,0 +1,127 @@
+"""
+СРАВНЕНИЕ ВАРИАНТОВ ПРОМТОВ: задержка, токены и точность формализации
+
+Запуск из каталога LLMTranslator:
+    # Записать ответы модели для обоих вариантов (один раз)
+    python -m benchmarks.prompt_variants --backend record --record-backend ollama
+    # Повторный прогон без модели
+    python -m benchmarks.prompt_variants --backend replay
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+from config import LLM_BACKEND, PROMPTS
+from benchmarks.problems import PROBLEMS, normalize_formula
+from modules.explainer import Explainer
+from modules.formalizer import Formalizer
+from modules.llm_backends import create_backend
+from modules.llm_usage import UsageTracker
+from modules.resolution_engine import ResolutionEngine
+
+
+def mean_of(records: list, field: str):
+    values = [r[field] for r in records if r.get(field) is not None]
+    return statistics.mean(values) if values else None
+
+
+def evaluate_variant(backend, variant: str) -> dict:
+    """
+    Прогоняет набор задач через формализатор и объяснятор с заданным вариантом промта
+    Засчитываются только ответы самой модели: формулы и объяснения из fallback-шаблонов
+    (они совпадают с эталоном на части задач) считаются промахом
+    """
+    tracker = UsageTracker()
+    formalizer = Formalizer(backend=backend, prompt_variant=variant, usage_tracker=tracker)
+    explainer = Explainer(backend=backend, prompt_variant=variant, usage_tracker=tracker)
+    prover = ResolutionEngine()
+
+    exact, proofs, good_explanations = 0, 0, 0
+    formalize_ms, explain_ms = [], []
+    for problem in PROBLEMS:
+        started = time.perf_counter()
+        formulas = formalizer.formalize(problem["text"])
+        formalize_ms.append((time.perf_counter() - started) * 1000)
+
+        from_model = not formalizer.used_fallback
+        if from_model and sorted(map(normalize_formula, formulas)) == sorted(map(normalize_formula, problem["formulas"])):
+            exact += 1
+        proved, steps = prover.prove(formulas)
+        if from_model and proved == problem["proved"]:
+            proofs += 1
+
+        started = time.perf_counter()
+        explanation = explainer.explain_proof(steps, problem["text"], proved)
+        explain_ms.append((time.perf_counter() - started) * 1000)
+        if not explainer.used_fallback and explainer._is_good_explanation(explanation):
+            good_explanations += 1
+
+    formalizer_calls = [r for r in tracker.records if r["module"] == "formalizer"]
+    explainer_calls = [r for r in tracker.records if r["module"] == "explainer"]
+    return {
+        "formalizer": {
+            "llm_calls": len(formalizer_calls),
+            "latency_ms": statistics.mean(formalize_ms),
+            "prompt_tokens": mean_of(formalizer_calls, "prompt_tokens"),
+            "completion_tokens": mean_of(formalizer_calls, "completion_tokens"),
+            "prompt_eval_ms": mean_of(formalizer_calls, "prompt_eval_ms"),
+            "decode_ms": mean_of(formalizer_calls, "decode_ms"),
+            "exact_match": exact / len(PROBLEMS),
+            "proof_match": proofs / len(PROBLEMS)
+        },
+        "explainer": {
+            "llm_calls": len(explainer_calls),
+            "latency_ms": statistics.mean(explain_ms),
+            "prompt_tokens": mean_of(explainer_calls, "prompt_tokens"),
+            "completion_tokens": mean_of(explainer_calls, "completion_tokens"),
+            "prompt_eval_ms": mean_of(explainer_calls, "prompt_eval_ms"),
+            "decode_ms": mean_of(explainer_calls, "decode_ms"),
+            "good_llm_explanations": good_explanations / len(PROBLEMS)
+        }
+    }
+
+
+def format_value(value) -> str:
+    if value is None:
+        return "—"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение вариантов промтов")
+    parser.add_argument("--backend", default="replay", help="ollama | openai | record | replay")
+    parser.add_argument("--record-backend", default=LLM_BACKEND["record_backend"])
+    parser.add_argument("--replay-file", default=LLM_BACKEND["replay_file"])
+    parser.add_argument("--latency", type=float, default=LLM_BACKEND["replay_latency"])
+    parser.add_argument("--per-token-latency", type=float, default=LLM_BACKEND["replay_per_token_latency"])
+    parser.add_argument("--variants", nargs="+", default=list(PROMPTS["formalizer"]))
+    args = parser.parse_args()
+
+    backend = create_backend({
+        "type": args.backend,
+        "record_backend": args.record_backend,
+        "replay_file": args.replay_file,
+        "replay_latency": args.latency,
+        "replay_per_token_latency": args.per_token_latency
+    })
+
+    results = {}
+    for variant in args.variants:
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[variant] = evaluate_variant(backend, variant)
+
+    print(f"Бэкенд: {backend.name}, задач: {len(PROBLEMS)}")
+    for module in ("formalizer", "explainer"):
+        print(f"\n{module}")
+        fields = list(results[args.variants[0]][module])
+        print(f"{'метрика':<24}" + "".join(f"{variant:>12}" for variant in args.variants))
+        for field in fields:
+            print(f"{field:<24}" + "".join(f"{format_value(results[v][module][field]):>12}" for v in args.variants))
+
+
+if __name__ == "__main__":
+    main()
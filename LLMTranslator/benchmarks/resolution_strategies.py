@@ -0,0 +1,76 @@
+"""
+СРАВНЕНИЕ СТРАТЕГИЙ ДВИЖКА РЕЗОЛЮЦИЙ НА ЦЕПОЧКАХ ИМПЛИКАЦИЙ
+Считает сгенерированные и сохраненные клаузы, шаги и время для каждой стратегии
+Выбор ¬ без UR здесь проигрывает базовой стратегии: он запрещает обратный вывод от цели,
+и движок насыщает цепочки для всех констант (длина 30, двухпосылочные звенья: 151 -> 506;
+на импликациях 91 -> 91). KBO без UR на двухпосылочных звеньях тоже генерирует больше (151 -> 323),
+поэтому упорядочение и выбор по умолчанию выключены
+
+Запуск из каталога LLMTranslator:
+    python -m benchmarks.resolution_strategies [--length 12] [--constants 4] [--distractors 2]
+"""
+import argparse
+import time
+
+from modules.resolution_engine import ResolutionEngine
+from modules.term_ordering import KBOrdering
+
+STRATEGIES = {
+    "базовая": {},
+    "kbo": {"ordering": KBOrdering()},
+    "выбор ¬": {"selection": "negative"},
+    "kbo + выбор ¬": {"ordering": KBOrdering(), "selection": "negative"},
+    "UR": {"ur_resolution": True},
+    "kbo + выбор ¬ + UR": {"ordering": KBOrdering(), "selection": "negative", "ur_resolution": True},
+}
+
+
+def chain_problem(length: int, constants: int, distractors: int, two_premise: bool) -> list:
+    """
+    Цепочка P0(c) -> P1(c) -> ... -> Pn(c) для нескольких констант и цель ¬Pn(C0)
+    distractors: лишние правила-ответвления на каждом звене
+    two_premise: звенья вида ¬Pi(x) ∨ ¬Доп(x) ∨ Pi+1(x) (полезны для UR-резолюции)
+    """
+    formulas = []
+    for k in range(constants):
+        formulas.append(f"P0(C{k})")
+        if two_premise:
+            formulas.append(f"Доп(C{k})")
+
+    for i in range(length):
+        if two_premise:
+            formulas.append(f"¬P{i}(x) ∨ ¬Доп(x) ∨ P{i + 1}(x)")
+        else:
+            formulas.append(f"∀x (P{i}(x) → P{i + 1}(x))")
+        for b in range(distractors):
+            formulas.append(f"∀x (P{i}(x) → Q{i}_{b}(x))")
+
+    formulas.append(f"¬P{length}(C0)")
+    return formulas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение стратегий резолюции на цепочках")
+    parser.add_argument("--length", type=int, default=12)
+    parser.add_argument("--constants", type=int, default=4)
+    parser.add_argument("--distractors", type=int, default=2)
+    parser.add_argument("--max-steps", type=int, default=20000)
+    args = parser.parse_args()
+
+    for two_premise in (False, True):
+        formulas = chain_problem(args.length, args.constants, args.distractors, two_premise)
+        kind = "двухпосылочные звенья" if two_premise else "импликации"
+        print(f"\nЦепочка длины {args.length} ({kind}), {len(formulas)} формул")
+        print(f"{'стратегия':<22} {'доказано':>9} {'сгенер.':>9} {'сохран.':>9} {'шагов':>7} {'мс':>9}")
+
+        for name, options in STRATEGIES.items():
+            engine = ResolutionEngine(max_steps=args.max_steps, verbose=False, **options)
+            started = time.perf_counter()
+            proved, _ = engine.prove(formulas)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"{name:<22} {str(proved):>9} {engine.stats['generated']:>9} {engine.stats['kept']:>9} "
+                  f"{engine.search_steps:>7} {elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+СПЕКУЛЯТИВНОЕ ДОКАЗАТЕЛЬСТВО ПРОТИВ ПОСЛЕДОВАТЕЛЬНОГО: задержка формализация + доказательство
+
+Запуск из каталога LLMTranslator:
+    # Записать ответы модели (один раз), затем сравнить с синтетической задержкой декодирования
+    python -m benchmarks.pipeline_benchmark --backend record --record-backend ollama
+    python -m benchmarks.speculative_benchmark --backend replay --latency 0.2 --per-token-latency 0.02
+
+Кроме задач с моделью прогоняются цепочки импликаций с готовыми формулами (цель приходит последней):
+на них насыщение префиксов расходует лимит шагов, и столбец «совпало» проверяет, что спекулятивный
+режим доказывает то же, что последовательный
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+from config import LLM_BACKEND, RESOLUTION_STRATEGY
+from benchmarks.problems import PROBLEMS
+from benchmarks.resolution_strategies import chain_problem
+from modules.formalizer import Formalizer
+from modules.llm_backends import create_backend
+from modules.resolution_engine import ResolutionEngine
+from modules.speculative import SpeculativeProver
+
+# (длина, константы, ответвления на звене)
+CHAIN_CASES = [(5, 4, 1), (10, 2, 0), (20, 2, 0), (30, 4, 1)]
+
+
+class FormulaStream:
+    """Формализатор с готовыми формулами: выдает их без модели, последняя формула завершает поток"""
+
+    def __init__(self, formulas: list):
+        self.formulas = formulas
+        self.stream_finished = False
+
+    def formalize(self, natural_language_text: str) -> list:
+        return list(self.formulas)
+
+    def formalize_stream(self, natural_language_text: str):
+        self.stream_finished = False
+        for number, formula in enumerate(self.formulas, 1):
+            self.stream_finished = number == len(self.formulas)
+            yield formula
+
+
+def run_sequential(formalizer, text: str) -> tuple:
+    started = time.perf_counter()
+    formulas = formalizer.formalize(text)
+    proved, _ = ResolutionEngine(**RESOLUTION_STRATEGY).prove(formulas)
+    return proved, (time.perf_counter() - started) * 1000
+
+
+def run_speculative(formalizer, text: str) -> dict:
+    prover = ResolutionEngine(**RESOLUTION_STRATEGY)
+    return SpeculativeProver(formalizer, prover).run(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Спекулятивное доказательство против последовательного")
+    parser.add_argument("--backend", default="replay", help="ollama | openai | replay")
+    parser.add_argument("--replay-file", default=LLM_BACKEND["replay_file"])
+    parser.add_argument("--latency", type=float, default=LLM_BACKEND["replay_latency"])
+    parser.add_argument("--per-token-latency", type=float, default=LLM_BACKEND["replay_per_token_latency"])
+    args = parser.parse_args()
+
+    backend = create_backend({
+        "type": args.backend,
+        "replay_file": args.replay_file,
+        "replay_latency": args.latency,
+        "replay_per_token_latency": args.per_token_latency
+    })
+
+    print(f"Бэкенд: {backend.name}")
+    cases = [(str(number), Formalizer(backend=backend), problem["text"])
+             for number, problem in enumerate(PROBLEMS, 1)]
+    cases += [(f"цепь {length}×{constants}", FormulaStream(chain_problem(length, constants, distractors, False)), "")
+              for length, constants, distractors in CHAIN_CASES]
+
+    print(f"{'задача':<12} {'послед., мс':>12} {'спекул., мс':>12} {'1-я формула':>12} {'отменено':>9} {'совпало':>8}")
+    sequential_ms, speculative_ms = [], []
+    for name, formalizer, text in cases:
+        with contextlib.redirect_stdout(io.StringIO()):
+            proved, sequential = run_sequential(formalizer, text)
+            result = run_speculative(formalizer, text)
+
+        sequential_ms.append(sequential)
+        speculative_ms.append(result["timings"]["total_ms"])
+        first = result["timings"].get("first_formula_ms")
+        print(f"{name:<12} {sequential:>12.1f} {result['timings']['total_ms']:>12.1f} "
+              f"{first if first is not None else float('nan'):>12.1f} {str(result['cancelled']):>9} "
+              f"{str(result['proved'] == proved):>8}")
+
+    mean_sequential, mean_speculative = statistics.mean(sequential_ms), statistics.mean(speculative_ms)
+    print(f"\nСреднее: последовательно {mean_sequential:.1f} мс, спекулятивно {mean_speculative:.1f} мс "
+          f"({(1 - mean_speculative / mean_sequential) * 100:.1f}% быстрее)")
+
+
+if __name__ == "__main__":
+    main()
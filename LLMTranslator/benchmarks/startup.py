@@ -0,0 +1,130 @@
+"""
+БЕНЧМАРК ЗАПУСКА: время импорта модулей и появления окна в чистом процессе
+Каждое измерение — отдельный процесс Python (медиана по --runs запускам);
+при превышении бюджета STARTUP_BUDGET_MS код возврата 1.
+Дополнительно проверяется, что движок резолюций импортируется без сторонних пакетов
+
+Запуск из каталога LLMTranslator:
+    python -m benchmarks.startup [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Целевые бюджеты, мс (без запуска самого интерпретатора)
+STARTUP_BUDGET_MS = {
+    "modules.resolution_engine": 50,
+    "modules.parallel_resolution": 50,
+    "modules.formalizer": 80,
+    "modules.explainer": 80,
+    "server": 150,
+    "main": 100,
+    "окно": 500,             # От начала импорта main до отрисованного окна
+    "модули готовы": 1500    # От начала импорта main до доступной кнопки доказательства
+}
+
+IMPORT_TARGETS = ["modules.resolution_engine", "modules.parallel_resolution", "modules.formalizer",
+                  "modules.explainer", "server", "main"]
+
+# Модули, которые должны импортироваться без сторонних пакетов
+STDLIB_ONLY = ["modules.resolution_engine", "modules.parallel_resolution"]
+
+LOCAL_PACKAGES = ("config", "modules", "benchmarks", "server", "main")
+
+IMPORT_SCRIPT = """
+import json, sys, time
+before = set(sys.modules)
+started = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - started) * 1000
+local = {local!r}
+third_party = sorted(name for name in set(sys.modules) - before
+                     if name.split(".")[0] not in sys.stdlib_module_names
+                     and name.split(".")[0] not in local and not name.startswith("__"))
+print(json.dumps({{"ms": elapsed, "third_party": third_party}}))
+"""
+
+WINDOW_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import tkinter as tk
+import main
+root = tk.Tk()
+app = main.LogicProverSystem(root)
+root.update()
+window_ms = (time.perf_counter() - started) * 1000
+while str(app.prove_btn.cget("state")) == "disabled" and time.perf_counter() - started < 30:
+    root.update()
+    time.sleep(0.001)
+ready_ms = (time.perf_counter() - started) * 1000
+root.destroy()
+print(json.dumps({"окно": window_ms, "модули готовы": ready_ms}))
+"""
+
+
+def run_script(script: str) -> dict:
+    # Рабочий каталог — LLMTranslator, как при обычном запуске
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True,
+                            timeout=60)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "ошибка процесса")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure_imports(runs: int) -> tuple:
+    timings, third_party = {}, {}
+    for module in IMPORT_TARGETS:
+        samples = []
+        for _ in range(runs):
+            result = run_script(IMPORT_SCRIPT.format(module=module, local=LOCAL_PACKAGES))
+            samples.append(result["ms"])
+        timings[module] = statistics.median(samples)
+        third_party[module] = result["third_party"]
+    return timings, third_party
+
+
+def measure_window(runs: int) -> dict:
+    samples = {}
+    for _ in range(runs):
+        for stage, value in run_script(WINDOW_SCRIPT).items():
+            samples.setdefault(stage, []).append(value)
+    return {stage: statistics.median(values) for stage, values in samples.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк запуска")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    timings, third_party = measure_imports(args.runs)
+    try:
+        timings.update(measure_window(args.runs))
+    except Exception as e:
+        print(f"⚠️  Окно не измерено (нужен дисплей): {e}")
+
+    failed = False
+    print(f"{'этап':<30} {'медиана, мс':>12} {'бюджет, мс':>11}")
+    for stage, value in timings.items():
+        budget = STARTUP_BUDGET_MS.get(stage)
+        verdict = ""
+        if budget is not None and value > budget:
+            verdict = "  ❌ превышен"
+            failed = True
+        print(f"{stage:<30} {value:>12.1f} {budget if budget is not None else '—':>11}{verdict}")
+
+    for module in STDLIB_ONLY:
+        if third_party[module]:
+            print(f"❌ {module} тянет сторонние пакеты: {', '.join(third_party[module])}")
+            failed = True
+        else:
+            print(f"✅ {module} импортируется только со стандартной библиотекой")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
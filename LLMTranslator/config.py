@@ -81,6 +81,33 @@ EXPLAINER_PROMPT = """
 ТЕПЕРЬ ОБЪЯСНИ СЛЕДУЮЩЕЕ ДОКАЗАТЕЛЬСТВО:
 """
 
+# Компактные варианты промтов: те же правила без капса и лишних примеров,
+# меньше токенов на prompt eval при каждом вызове
+FORMALIZER_PROMPT_COMPACT = """
+Переведи задачу на русском языке в формулы логики предикатов с русскими именами предикатов и констант.
+Выведи только формулы через запятую, без пояснений.
+Форматы: Предикат(Объект), ¬Предикат(Объект), А(x) ∨ Б(x), А(x) ∧ Б(x), ∀x (А(x) → Б(x)).
+Чтобы доказать утверждение P, добавь ¬P.
+Пример: "Сократ — человек. Все люди смертны. Докажи, что Сократ смертен." -> Человек(Сократ), ∀x (Человек(x) → Смертен(x)), ¬Смертен(Сократ)
+"""
+
+EXPLAINER_PROMPT_COMPACT = """
+Ты учитель логики. Объясни доказательство методом резолюций простым русским языком, по шагам:
+что доказываем, как из посылок получаются выводы, в чем противоречие и почему оно доказывает утверждение.
+Используй термины исходной задачи. Если доказательство не удалось, объясни почему.
+"""
+
+PROMPTS = {
+    "formalizer": {"full": FORMALIZER_PROMPT, "compact": FORMALIZER_PROMPT_COMPACT},
+    "explainer": {"full": EXPLAINER_PROMPT, "compact": EXPLAINER_PROMPT_COMPACT}
+}
+
+# Вариант промта для каждого модуля: full | compact
+PROMPT_VARIANTS = {
+    "formalizer": "full",
+    "explainer": "full"
+}
+
 UI_MESSAGES = {
     "title": "🧠 Система Логического Вывода: Переводчик-Математик-Переводчик",
     "description": """Архитектура из трех модулей согласно техническому заданию:
@@ -97,4 +124,71 @@ UI_MESSAGES = {
         "Все птицы летают. Пингвин — птица. Пингвин не летает. Докажи противоречие.",
         "Если идет дождь, то улица мокрая. Улица мокрая. Значит, идет дождь?"
     ]
-}
\ No newline at end of file
+}
+
+# HTTP-сервис (server.py): параллельная обработка запросов других сервисов
+SERVER_CONFIG = {
+    "host": "127.0.0.1",
+    "port": 8080,
+    "llm_concurrency": 4,       # Одновременных запросов к LLM
+    "prover_processes": 2,      # Процессов для ResolutionEngine
+    "request_workers": 8,       # Одновременно обрабатываемых запросов
+    "queue_size": 64,           # Размер очереди; при переполнении отвечаем 503
+    "llm_timeout": 120.0,
+    "max_body_bytes": 1000000,  # Максимальный размер тела запроса; больше — ответ 413
+    "read_timeout": 10.0,       # Секунд на чтение заголовков и отдельно на чтение тела; иначе ответ 408
+    "prover_max_clauses": 20000  # Лимит множества клауз доказательства в пуле (ограничивает время и память)
+}
+
+# LLM-бэкенд для формализатора и объяснятора
+LLM_BACKEND = {
+    "type": "ollama",                               # ollama | openai | record | replay
+    "model": "qwen2.5:7b",
+    "timeout": 120.0,
+    # ollama
+    "ollama_host": "http://localhost:11434",
+    # openai: любой OpenAI-совместимый локальный сервер
+    "openai_base_url": "http://localhost:8000/v1",
+    "openai_api_key": "",
+    # record/replay: запись ответов и их воспроизведение без модели
+    "replay_file": "llm_recordings.jsonl",
+    "record_backend": "ollama",                     # Какой бэкенд записывать в режиме record
+    "replay_latency": 0.0,                          # Синтетическая задержка на ответ, с
+    "replay_per_token_latency": 0.0                 # Синтетическая задержка на токен ответа, с
+}
+
+
+# Графический интерфейс (main.py)
+GUI_CONFIG = {
+    "poll_ms": 50,                  # Период опроса очереди обновлений GUI
+    "batch_size": 500,              # Сколько шагов доказательства выводить за один тик
+    "max_visible_lines": 2000,      # Сколько последних шагов держит вкладка; полный лог — по кнопке
+    "prover_max_steps": 50          # Лимит шагов движка резолюций
+}
+
+# Стратегия движка резолюций
+RESOLUTION_STRATEGY = {
+    "ordering": None,               # None | "kbo": упорядоченная резолюция (KBO)
+    "selection": None,              # None | "negative": резолюция только по выбранному отрицательному литералу
+                                    # (прямой вывод от фактов; без UR на цепочках генерирует больше клауз)
+    "ur_resolution": False          # UR-резолюция: ядро из 3+ литералов против единичных клауз за один шаг
+}
+
+# Параллельная генерация резольвент внутри одного доказательства (результат как у последовательного движка)
+PARALLEL_PROVER = {
+    "enabled": False,
+    "workers": None,                # Число рабочих процессов; None — по числу ядер
+    "min_clauses": 200              # Меньшие множества клауз обрабатываются без пересылки в процессы
+}
+
+# Конвейер в main.py
+PIPELINE_CONFIG = {
+    "speculative_proving": False    # Доказывать по мере потоковой формализации, отменяя генерацию при противоречии
+}
+
+# Маршрутизация объяснений: короткие стандартные выводы объясняются по структуре, без LLM
+EXPLANATION_ROUTING = {
+    "enabled": True,
+    "max_structural_steps": 6,      # Максимум шагов вывода ◻ для детерминированного объяснения
+    "max_latency_samples": 1000     # Сколько последних задержек хранить для статистики
+}
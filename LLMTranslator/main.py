@@ -1,11 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import threading
-import time
-from config import UI_MESSAGES
-from modules.formalizer import Formalizer
-from modules.resolution_engine import ResolutionEngine
-from modules.explainer import Explainer
+import queue
+from config import UI_MESSAGES, GUI_CONFIG, RESOLUTION_STRATEGY, PIPELINE_CONFIG, PARALLEL_PROVER
+
+# Модули конвейера импортируются в фоновом потоке (_load_modules), чтобы окно появлялось сразу
 
 class LogicProverSystem:
     """
@@ -14,14 +13,61 @@ class LogicProverSystem:
 
     def __init__(self, root):
         self.root = root
-        self.setup_gui()
 
-        # Инициализация модулей ТОЧНО как в задании
-        self.formalizer = Formalizer()      # Модуль 1: LLM-формализатор
-        self.prover = ResolutionEngine()    # Модуль 2: Движок резолюций
-        self.explainer = Explainer()        # Модуль 3: LLM-объяснятор
+        # Все обновления GUI из рабочего потока идут через эту очередь;
+        # главный поток забирает их порциями по таймеру after
+        self.ui_queue = queue.Queue()
+        self.proof_log = []          # Полный лог доказательства (виджет хранит только хвост)
+        self.proof_header_lines = 0  # Строк заголовка во вкладке доказательства (не обрезаются)
+
+        self.setup_gui()
 
+        # Кнопка доступна, когда модули загружены в фоновом потоке
         self.is_processing = False
+        self.prove_btn.config(state='disabled')
+        self.status_label.config(text="⏳ Загрузка модулей...")
+        self.root.after(GUI_CONFIG["poll_ms"], self.process_ui_queue)
+
+        thread = threading.Thread(target=self._load_modules)
+        thread.daemon = True
+        thread.start()
+
+    def _load_modules(self):
+        """Импортирует и создает модули вне главного потока Tk"""
+        try:
+            from modules.formalizer import Formalizer
+            from modules.resolution_engine import ResolutionEngine
+            from modules.explainer import Explainer
+            from modules.explanation_router import ExplanationRouter
+            from modules.llm_backends import create_backend
+
+            # Инициализация модулей ТОЧНО как в задании
+            backend = create_backend()          # LLM-бэкенд выбирается в config.py, клиент создается при первом запросе
+            self.formalizer = Formalizer(backend=backend)   # Модуль 1: LLM-формализатор
+            prover_options = dict(max_steps=GUI_CONFIG["prover_max_steps"],
+                                  step_callback=self.on_proof_step,
+                                  verbose=False,
+                                  **RESOLUTION_STRATEGY)
+            if PARALLEL_PROVER["enabled"]:
+                from modules.parallel_resolution import ParallelResolutionEngine
+                self.prover = ParallelResolutionEngine(workers=PARALLEL_PROVER["workers"],
+                                                       min_clauses=PARALLEL_PROVER["min_clauses"],
+                                                       **prover_options)  # Модуль 2: Движок резолюций
+            else:
+                self.prover = ResolutionEngine(**prover_options)  # Модуль 2: Движок резолюций
+            self.explainer = Explainer(backend=backend)     # Модуль 3: LLM-объяснятор
+            self.explanation_router = ExplanationRouter(self.explainer)  # Простые выводы объясняются без LLM
+
+        except Exception as e:
+            message = f"Не удалось загрузить модули: {str(e)}"
+            self.update_status(f"❌ {message}")
+            self.ui_queue.put(("call", lambda: messagebox.showerror("Ошибка", message)))
+            return
+
+        def ready():
+            self.prove_btn.config(state='normal')
+            self.status_label.config(text="Готов к работе")
+        self.ui_queue.put(("call", ready))
 
     def setup_gui(self):
         """Настраивает графический интерфейс"""
@@ -83,6 +129,9 @@ class LogicProverSystem:
 
         # Вкладка Модуля 2
         proof_frame = ttk.Frame(notebook, padding="10")
+        self.full_log_btn = ttk.Button(proof_frame, text="📜 Показать полный лог",
+                                       command=self.show_full_log)
+        self.full_log_btn.pack(anchor=tk.E, pady=(0, 5))
         self.proof_text = scrolledtext.ScrolledText(proof_frame, width=100, height=8, wrap=tk.WORD)
         self.proof_text.pack(fill=tk.BOTH, expand=True)
         notebook.add(proof_frame, text="⚡ Модуль 2: Доказательство")
@@ -117,41 +166,54 @@ class LogicProverSystem:
         # Очистка предыдущих результатов
         for widget in [self.formalize_text, self.proof_text, self.explain_text]:
             widget.delete(1.0, tk.END)
+        self.proof_log = []
+        self.proof_header_lines = 0
 
-        thread = threading.Thread(target=self.run_proof_process)
+        # Текст читается здесь, в главном потоке: рабочий поток не обращается к виджетам
+        input_text = self.input_text.get(1.0, tk.END).strip()
+        thread = threading.Thread(target=self.run_proof_process, args=(input_text,))
         thread.daemon = True
         thread.start()
 
-    def run_proof_process(self):
+    def run_proof_process(self, input_text):
         """Запускает полный процесс трех модулей согласно архитектуре из задания"""
         try:
-            input_text = self.input_text.get(1.0, tk.END).strip()
-
-            # === МОДУЛЬ 1: LLM-формализатор ===
-            self.update_status("🔍 Модуль 1: Преобразую естественный язык в логику...")
-            formulas = self.formalizer.formalize(input_text)
-            self.update_text(self.formalize_text,
-                         "🤖 LLM-ФОРМАЛИЗАТОР: Перевод с русского на язык логики\n\n"
-                         f"ВХОД: {input_text}\n\n"
-                         "ВЫХОД (формальный язык):\n" +
-                         "\n".join(f"• {formula}" for formula in formulas))
-            time.sleep(1)
-
-            # === МОДУЛЬ 2: Движок резолюций ===
-            self.update_status("⚡ Модуль 2: Выполняю строгое доказательство...")
-            proved, proof_steps = self.prover.prove(formulas)
+            formalize_header = ("🤖 LLM-ФОРМАЛИЗАТОР: Перевод с русского на язык логики\n\n"
+                                f"ВХОД: {input_text}\n\n"
+                                "ВЫХОД (формальный язык):\n")
+            proof_header = "🧮 ДВИЖОК РЕЗОЛЮЦИЙ: Строгое доказательство\n\nШАГИ ДОКАЗАТЕЛЬСТВА:\n"
+
+            if PIPELINE_CONFIG["speculative_proving"]:
+                from modules.speculative import SpeculativeProver
+
+                # === МОДУЛИ 1 и 2 одновременно: доказательство по мере генерации формул ===
+                self.update_status("🔍⚡ Модули 1 и 2: Формализую и сразу доказываю...")
+                self.update_text(self.formalize_text, formalize_header)
+                self.start_proof_log(proof_header)
+                result = SpeculativeProver(self.formalizer, self.prover).run(
+                    input_text, on_formula=lambda formula: self.append_text(self.formalize_text, f"• {formula}\n"))
+                proved, proof_steps = result["proved"], result["steps"]
+                if result["cancelled"]:
+                    self.append_text(self.formalize_text, "\n⏹️ Генерация остановлена: противоречие уже найдено")
+            else:
+                # === МОДУЛЬ 1: LLM-формализатор ===
+                self.update_status("🔍 Модуль 1: Преобразую естественный язык в логику...")
+                formulas = self.formalizer.formalize(input_text)
+                self.update_text(self.formalize_text,
+                                 formalize_header + "\n".join(f"• {formula}" for formula in formulas))
+
+                # === МОДУЛЬ 2: Движок резолюций ===
+                # Шаги выводятся по мере получения через on_proof_step
+                self.update_status("⚡ Модуль 2: Выполняю строгое доказательство...")
+                self.start_proof_log(proof_header)
+                proved, proof_steps = self.prover.prove(formulas)
 
             proof_result = "✅ ДОКАЗАТЕЛЬСТВО УСПЕШНО" if proved else "❌ ДОКАЗАТЕЛЬСТВО НЕ НАЙДЕНО"
-            proof_content = f"🧮 ДВИЖОК РЕЗОЛЮЦИЙ: Строгое доказательство\n\n"
-            proof_content += f"РЕЗУЛЬТАТ: {proof_result}\n\n"
-            proof_content += "ШАГИ ДОКАЗАТЕЛЬСТВА:\n" + "\n".join(f"• {step}" for step in proof_steps)
-
-            self.update_text(self.proof_text, proof_content)
-            time.sleep(1)
+            self.ui_queue.put(("proof_step", f"\nРЕЗУЛЬТАТ: {proof_result}"))
 
             # === МОДУЛЬ 3: LLM-объяснятор ===
             self.update_status("🎓 Модуль 3: Объясняю доказательство на естественном языке...")
-            explanation = self.explainer.explain_proof(proof_steps, input_text, proved)
+            explanation = self.explanation_router.explain(proof_steps, input_text, proved, self.prover.refutation)
 
             explain_content = f"🎓 LLM-ОБЪЯСНЯТОР: Перевод с языка логики на русский\n\n"
             explain_content += explanation
@@ -162,24 +224,100 @@ class LogicProverSystem:
 
         except Exception as e:
             self.update_status(f"❌ Ошибка: {str(e)}")
-            messagebox.showerror("Ошибка", f"Произошла ошибка: {str(e)}")
+            message = f"Произошла ошибка: {str(e)}"
+            self.ui_queue.put(("call", lambda: messagebox.showerror("Ошибка", message)))
 
         finally:
             self.complete_process()
 
+    def on_proof_step(self, step):
+        """Получает шаг доказательства из рабочего потока"""
+        self.ui_queue.put(("proof_step", f"• {step}"))
+
+    def start_proof_log(self, header):
+        """Выводит заголовок вкладки доказательства перед потоком шагов"""
+        def update():
+            self.proof_text.delete(1.0, tk.END)
+            self.proof_text.insert(tk.END, header)
+            self.proof_header_lines = header.count("\n")
+            self.proof_log = [header.rstrip("\n")]
+        self.ui_queue.put(("call", update))
+
+    def process_ui_queue(self):
+        """
+        Забирает из очереди не больше batch_size обновлений за тик,
+        чтобы главный цикл Tk оставался отзывчивым при длинных доказательствах
+        """
+        steps = []
+        try:
+            for _ in range(GUI_CONFIG["batch_size"]):
+                kind, payload = self.ui_queue.get_nowait()
+                if kind == "proof_step":
+                    steps.append(payload)
+                    continue
+                # Сохраняем порядок: сначала выводим накопленные шаги
+                self.append_proof_steps(steps)
+                steps = []
+                payload()
+        except queue.Empty:
+            pass
+        self.append_proof_steps(steps)
+
+        delay = 1 if not self.ui_queue.empty() else GUI_CONFIG["poll_ms"]
+        self.root.after(delay, self.process_ui_queue)
+
+    def append_proof_steps(self, steps):
+        """Добавляет порцию шагов одной вставкой и обрезает виджет до max_visible_lines"""
+        if not steps:
+            return
+        self.proof_log.extend(steps)
+        self.proof_text.insert(tk.END, "\n".join(steps) + "\n")
+
+        max_lines = self.proof_header_lines + GUI_CONFIG["max_visible_lines"]
+        total_lines = int(self.proof_text.index("end-1c").split(".")[0]) - 1  # Без пустой последней строки
+        if total_lines > max_lines:
+            first = self.proof_header_lines + 1
+            self.proof_text.delete(f"{first}.0", f"{first + total_lines - max_lines}.0")
+            self.full_log_btn.config(text=f"📜 Показать полный лог ({len(self.proof_log)} строк)")
+        self.proof_text.see(tk.END)
+
+    def show_full_log(self):
+        """Открывает полный лог доказательства в отдельном окне (заполняется порциями)"""
+        log = list(self.proof_log)
+        window = tk.Toplevel(self.root)
+        window.title("📜 Полный лог доказательства")
+        window.geometry("900x600")
+        text = scrolledtext.ScrolledText(window, wrap=tk.WORD)
+        text.pack(fill=tk.BOTH, expand=True)
+
+        batch_size = GUI_CONFIG["batch_size"]
+
+        def insert_batch(start=0):
+            if not text.winfo_exists():
+                return
+            text.insert(tk.END, "\n".join(log[start:start + batch_size]) + "\n")
+            if start + batch_size < len(log):
+                self.root.after(1, insert_batch, start + batch_size)
+
+        insert_batch()
+
     def update_status(self, message):
         """Обновляет статус из основного потока"""
         def update():
             self.status_label.config(text=message)
             print(message)
-        self.root.after(0, update)
+        self.ui_queue.put(("call", update))
 
     def update_text(self, text_widget, content):
         """Обновляет текстовый виджет из основного потока"""
         def update():
             text_widget.delete(1.0, tk.END)
             text_widget.insert(tk.END, content)
-        self.root.after(0, update)
+        self.ui_queue.put(("call", update))
+
+    def append_text(self, text_widget, content):
+        """Дописывает текст в виджет из основного потока"""
+        self.ui_queue.put(("call", lambda: text_widget.insert(tk.END, content)))
 
     def complete_process(self):
         """Завершает процесс"""
@@ -187,7 +325,7 @@ class LogicProverSystem:
             self.is_processing = False
             self.prove_btn.config(state='normal')
             self.progress.stop()
-        self.root.after(0, update)
+        self.ui_queue.put(("call", update))
 
 def main():
     root = tk.Tk()
@@ -1,5 +1,8 @@
-import ollama
-from config import EXPLAINER_PROMPT
+import time
+
+from config import PROMPTS, PROMPT_VARIANTS, LLM_BACKEND
+from modules.llm_backends import LLMBackend, create_backend
+from modules.llm_usage import USAGE_TRACKER, UsageTracker
 
 class Explainer:
     """
@@ -7,9 +10,20 @@ class Explainer:
     Улучшенная версия с качественными объяснениями
     """
 
-    def __init__(self, model: str = "qwen2.5:7b"):
-        self.model = model
-        self.system_prompt = EXPLAINER_PROMPT
+    def __init__(self, model: str = None, backend: LLMBackend = None, prompt_variant: str = None,
+                 usage_tracker: UsageTracker = None):
+        self.model = model or LLM_BACKEND["model"]
+        self.backend = backend or create_backend()
+        self.prompt_variant = prompt_variant or PROMPT_VARIANTS["explainer"]
+        self.system_prompt = PROMPTS["explainer"][self.prompt_variant]
+        self.usage_tracker = usage_tracker or USAGE_TRACKER
+        self.last_usage = None
+        self.used_fallback = False  # True, если последнее объяснение построено по шаблону, а не моделью
+        self.options = {
+            'temperature': 0.4,  # Немного больше креативности для естественного объяснения
+            'top_p': 0.9,
+            'num_predict': 1000  # Даем больше токенов для развернутого объяснения
+        }
 
     def explain_proof(self, logical_steps: list, original_query: str, proof_success: bool) -> str:
         """
@@ -18,44 +32,80 @@ class Explainer:
         print("🎓 Модуль 3 (Объяснятор): Начинаю преобразование логических шагов в русское объяснение...")
         print(f"📊 Результат доказательства: {'УСПЕХ' if proof_success else 'НЕУДАЧА'}")
         print(f"📋 Количество шагов: {len(logical_steps)}")
+        self.used_fallback = False
 
         # Формируем детализированный вход для объяснения
         steps_text = self._create_detailed_steps_text(logical_steps, original_query, proof_success)
 
         try:
-            response = ollama.chat(
+            started = time.perf_counter()
+            response = self.backend.chat(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self.system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": steps_text
-                    }
-                ],
-                options={
-                    'temperature': 0.4,  # Немного больше креативности для естественного объяснения
-                    'top_p': 0.9,
-                    'num_predict': 1000  # Даем больше токенов для развернутого объяснения
-                }
+                messages=self._build_messages(steps_text),
+                options=self.options
             )
+            self._record_usage(response, started)
+            return self._process_response(response, logical_steps, original_query, proof_success)
+
+        except Exception as e:
+            print(f"❌ Модуль 3: Ошибка при генерации объяснения: {e}")
+            return self._create_quality_explanation(logical_steps, original_query, proof_success)
 
-            explanation = response['message']['content'].strip()
+    async def explain_proof_async(self, logical_steps: list, original_query: str, proof_success: bool,
+                                  llm_client) -> str:
+        """
+        Асинхронный вариант explain_proof: запрос к модели идет через AsyncLLMClient
+        """
+        print(f"🎓 Модуль 3 (Объяснятор, async): {len(logical_steps)} шагов")
+        self.used_fallback = False
 
-            # Проверяем качество объяснения
-            if self._is_good_explanation(explanation):
-                print("✅ Модуль 3: Качественное объяснение успешно сгенерировано")
-                return explanation
-            else:
-                print("⚠️  Объяснение требует улучшения, использую улучшенный fallback")
-                return self._create_quality_explanation(logical_steps, original_query, proof_success)
+        steps_text = self._create_detailed_steps_text(logical_steps, original_query, proof_success)
+
+        try:
+            started = time.perf_counter()
+            response = await llm_client.chat(
+                model=self.model,
+                messages=self._build_messages(steps_text),
+                options=self.options
+            )
+            self._record_usage(response, started)
+            return self._process_response(response, logical_steps, original_query, proof_success)
 
         except Exception as e:
             print(f"❌ Модуль 3: Ошибка при генерации объяснения: {e}")
             return self._create_quality_explanation(logical_steps, original_query, proof_success)
 
+    def _build_messages(self, steps_text: str) -> list:
+        """Формирует сообщения для модели"""
+        return [
+            {
+                "role": "system",
+                "content": self.system_prompt
+            },
+            {
+                "role": "user",
+                "content": steps_text
+            }
+        ]
+
+    def _record_usage(self, response: dict, started: float):
+        """Записывает токены и время вызова модели"""
+        self.last_usage = self.usage_tracker.record("explainer", self.prompt_variant, response,
+                                                    (time.perf_counter() - started) * 1000)
+        print(f"📊 Токены: промт {self.last_usage['prompt_tokens']}, ответ {self.last_usage['completion_tokens']}")
+
+    def _process_response(self, response, logical_steps: list, original_query: str, proof_success: bool) -> str:
+        """Извлекает объяснение из ответа модели и проверяет его качество"""
+        explanation = response['message']['content'].strip()
+
+        # Проверяем качество объяснения
+        if self._is_good_explanation(explanation):
+            print("✅ Модуль 3: Качественное объяснение успешно сгенерировано")
+            return explanation
+        else:
+            print("⚠️  Объяснение требует улучшения, использую улучшенный fallback")
+            return self._create_quality_explanation(logical_steps, original_query, proof_success)
+
     def _create_detailed_steps_text(self, logical_steps: list, original_query: str, proof_success: bool) -> str:
         """Создает детализированный текст шагов для объяснения"""
         steps_text = "\n".join([f"Шаг {i + 1}: {step}" for i, step in enumerate(logical_steps)])
@@ -92,6 +142,7 @@ class Explainer:
         """
         Создает качественное объяснение в стиле варианта 3
         """
+        self.used_fallback = True
         if proof_success:
             return self._create_success_explanation_v3(steps, query)
         else:
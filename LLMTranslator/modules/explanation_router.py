@@ -0,0 +1,160 @@
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from config import EXPLANATION_ROUTING
+from modules.explainer import Explainer
+
+
+class StructuralExplainer:
+    """
+    Детерминированный объяснятор: строит объяснение прямо по структуре вывода ◻
+    Понимает цепочки modus ponens / modus tollens и прямое противоречие фактов
+    """
+
+    def explain(self, refutation: List[Dict], query: str) -> str:
+        """Возвращает объяснение или None, если вывод не подходит под стандартные шаблоны"""
+        if not refutation:
+            return None
+
+        *chain, final = refutation
+        if len(final["parents"]) != 2 or not all(len(p) == 1 for p in final["parents"]):
+            return None
+
+        lines = []
+        for number, step in enumerate(chain, 1):
+            sentence = self._explain_chain_step(step)
+            if sentence is None:
+                return None
+            lines.append(f"{number}. {sentence}")
+
+        derived_clauses = {self._clause(step["clause"]) for step in chain}
+        first, second = (self._clause(parent) for parent in final["parents"])
+        if first not in derived_clauses and second in derived_clauses:
+            first, second = second, first
+
+        if first not in derived_clauses:
+            sentence = f"Посылки {first} и {second} прямо противоречат друг другу."
+        elif second not in derived_clauses:
+            sentence = f"Получено {first}, но посылка утверждает {second} — это противоречие."
+        else:
+            sentence = f"Получены {first} и {second} — они противоречат друг другу."
+        lines.append(f"{len(chain) + 1}. {sentence}")
+
+        return "\n".join([
+            "🎉 ДОКАЗАТЕЛЬСТВО УСПЕШНО ЗАВЕРШЕНО!",
+            "",
+            f"Исходный вопрос: «{query}»",
+            "",
+            "Доказываем от противного: добавляем отрицание утверждения к посылкам и ищем противоречие.",
+            "",
+            *lines,
+            "",
+            "ВЫВОД: Предположение приводит к противоречию, значит, оно ложно, а исходное утверждение доказано."
+        ])
+
+    def _explain_chain_step(self, step: Dict) -> str:
+        """Шаг вида: правило из двух литералов + единичная клауза -> единичная клауза"""
+        if step["rule"] != "Резолюция" or len(step["clause"]) != 1 or len(step["parents"]) != 2:
+            return None
+
+        units = [p for p in step["parents"] if len(p) == 1]
+        rules = [p for p in step["parents"] if len(p) == 2]
+        if len(units) != 1 or len(rules) != 1:
+            return None
+
+        unit, rule, result = units[0], rules[0], step["clause"]
+        negative = [lit for lit in rule if lit[2]]
+        positive = [lit for lit in rule if not lit[2]]
+        if len(negative) == 1 and len(positive) == 1:
+            condition = self._literal((negative[0][0], negative[0][1], False))
+            rule_text = f"правила «если {condition}, то {self._literal(positive[0])}»"
+            if unit[0][2]:
+                return f"Из {rule_text} и {self._clause(unit)} следует {self._clause(result)} (modus tollens)."
+            return f"Из {rule_text} и факта {self._clause(unit)} следует {self._clause(result)} (modus ponens)."
+
+        return f"Из посылки «{self._clause(rule)}» и {self._clause(unit)} следует {self._clause(result)}."
+
+    @staticmethod
+    def _literal(literal: Tuple) -> str:
+        pred, args, neg = literal
+        text = ("¬" if neg else "") + pred
+        if args:
+            text += f"({', '.join(args)})"
+        return text
+
+    def _clause(self, clause: List[Tuple]) -> str:
+        return " ∨ ".join(self._literal(lit) for lit in clause) if clause else "◻"
+
+
+class ExplanationRouter:
+    """
+    Маршрутизатор объяснений по размеру и форме вывода:
+    короткие стандартные выводы объясняются детерминированно, сложные — LLM-объяснятором
+    """
+
+    def __init__(self, explainer: Explainer, structural: StructuralExplainer = None, settings: dict = None):
+        self.explainer = explainer
+        self.structural = structural or StructuralExplainer()
+        self.settings = dict(EXPLANATION_ROUTING, **(settings or {}))
+        self._lock = threading.Lock()
+        self._counts = {"structural": 0, "llm": 0}
+        self._latencies = {"structural": [], "llm": []}  # Последние max_latency_samples значений, мс
+
+    def explain(self, proof_steps: list, query: str, proof_success: bool, refutation: List[Dict] = None) -> str:
+        """Объясняет доказательство; refutation — вывод ◻ из ResolutionEngine.refutation"""
+        started = time.perf_counter()
+        explanation = self._try_structural(query, proof_success, refutation)
+        if explanation is not None:
+            self._record("structural", started)
+            return explanation
+
+        explanation = self.explainer.explain_proof(proof_steps, query, proof_success)
+        self._record("llm", started)
+        return explanation
+
+    async def explain_async(self, proof_steps: list, query: str, proof_success: bool,
+                            refutation: List[Dict], llm_client) -> str:
+        """Асинхронный вариант explain: запрос к LLM идет через AsyncLLMClient"""
+        started = time.perf_counter()
+        explanation = self._try_structural(query, proof_success, refutation)
+        if explanation is not None:
+            self._record("structural", started)
+            return explanation
+
+        explanation = await self.explainer.explain_proof_async(proof_steps, query, proof_success, llm_client)
+        self._record("llm", started)
+        return explanation
+
+    def _try_structural(self, query: str, proof_success: bool, refutation: List[Dict]) -> str:
+        if not self.settings["enabled"] or not proof_success or not refutation:
+            return None
+        if len(refutation) > self.settings["max_structural_steps"]:
+            return None
+
+        explanation = self.structural.explain(refutation, query)
+        if explanation is not None:
+            print(f"🎓 Модуль 3: Вывод из {len(refutation)} шагов объяснен по структуре, без LLM")
+        return explanation
+
+    def _record(self, route: str, started: float):
+        with self._lock:
+            self._counts[route] += 1
+            latencies = self._latencies[route]
+            latencies.append((time.perf_counter() - started) * 1000)
+            if len(latencies) > self.settings["max_latency_samples"]:
+                del latencies[0]
+
+    def stats(self) -> dict:
+        """Сколько объяснений ушло по каждому маршруту и их задержки"""
+        with self._lock:
+            counts = dict(self._counts)
+            snapshot = {route: list(latencies) for route, latencies in self._latencies.items()}
+        return {
+            route: {
+                "count": counts[route],
+                "avg_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+                "max_ms": round(max(latencies), 3) if latencies else 0.0
+            }
+            for route, latencies in snapshot.items()
+        }
@@ -1,5 +1,8 @@
-import ollama
-from config import FORMALIZER_PROMPT
+import time
+
+from config import PROMPTS, PROMPT_VARIANTS, LLM_BACKEND
+from modules.llm_backends import LLMBackend, create_backend
+from modules.llm_usage import USAGE_TRACKER, UsageTracker
 
 
 class Formalizer:
@@ -8,15 +11,29 @@ class Formalizer:
     Детальная реализация с явным контролем русского языка
     """
 
-    def __init__(self, model: str = "qwen2.5:7b"):
-        self.model = model
-        self.system_prompt = FORMALIZER_PROMPT
-        self._verify_russian_support()
+    def __init__(self, model: str = None, backend: LLMBackend = None, prompt_variant: str = None,
+                 usage_tracker: UsageTracker = None):
+        self.model = model or LLM_BACKEND["model"]
+        self.backend = backend or create_backend()
+        self.prompt_variant = prompt_variant or PROMPT_VARIANTS["formalizer"]
+        self.system_prompt = PROMPTS["formalizer"][self.prompt_variant]
+        self.usage_tracker = usage_tracker or USAGE_TRACKER
+        self.last_usage = None
+        self.stream_finished = False
+        self.used_fallback = False  # True, если формулы последнего вызова взяты из fallback, а не из ответа модели
+        self.options = {
+            'temperature': 0.1,  # Минимальная креативность для точного следования формату
+            'top_k': 1,
+            'top_p': 0.1
+        }
+        if self.prompt_variant == "full":
+            self._verify_russian_support()
 
     def _verify_russian_support(self):
         """Проверяет и улучшает поддержку русского языка"""
         print("🔍 Проверяю поддержку русского языка в модели...")
         # Добавляем явное указание на русский в системный промт
+        # (компактный промт уже требует русские термины, ему это не нужно)
         self.system_prompt += "\n\nПОМНИ: Ты должен работать с РУССКИМ языком и выводить формулы на основе РУССКИХ терминов!"
 
     def formalize(self, natural_language_text: str) -> list:
@@ -26,69 +43,160 @@ class Formalizer:
         """
         print("🔍 Модуль 1 (Формализатор): Начинаю преобразование русского текста в логику...")
         print(f"📥 Входной текст: {natural_language_text}")
+        self.used_fallback = False
 
         try:
-            # Явно указываем в запросе использование русского языка
-            enhanced_prompt = f"{self.system_prompt}\n\nРУССКИЙ ТЕКСТ ДЛЯ ПРЕОБРАЗОВАНИЯ: {natural_language_text}"
-
-            response = ollama.chat(
+            started = time.perf_counter()
+            response = self.backend.chat(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self.system_prompt  # ✅ Общие инструкции
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Преобразуй этот русский текст в формулы логики предикатов: '{natural_language_text}'. Выведи ТОЛЬКО формулы, разделенные запятыми."
-                    }
-                ],
-                options={
-                    'temperature': 0.1,  # Минимальная креативность для точного следования формату
-                    'top_k': 1,
-                    'top_p': 0.1
-                }
+                messages=self._build_messages(natural_language_text),
+                options=self.options
             )
+            self._record_usage(response, started)
+            return self._process_response(response, natural_language_text)
 
-            formulas_text = response['message']['content'].strip()
-            print(f"📝 Сырой ответ модели: {formulas_text}")
+        except Exception as e:
+            print(f"❌ Модуль 1: Ошибка при работе с моделью: {e}")
+            return self._get_enhanced_fallback_formulas(natural_language_text)
 
-            # Строгая проверка и очистка вывода
-            formulas = self._parse_and_validate_formulas(formulas_text, natural_language_text)
+    async def formalize_async(self, natural_language_text: str, llm_client) -> list:
+        """
+        Асинхронный вариант formalize: запрос к модели идет через AsyncLLMClient
+        """
+        print(f"🔍 Модуль 1 (Формализатор, async): {natural_language_text}")
+        self.used_fallback = False
 
-            print(f"✅ Модуль 1: Успешно преобразовал в {len(formulas)} логических формул(ы)")
-            return formulas
+        try:
+            started = time.perf_counter()
+            response = await llm_client.chat(
+                model=self.model,
+                messages=self._build_messages(natural_language_text),
+                options=self.options
+            )
+            self._record_usage(response, started)
+            return self._process_response(response, natural_language_text)
 
         except Exception as e:
             print(f"❌ Модуль 1: Ошибка при работе с моделью: {e}")
             return self._get_enhanced_fallback_formulas(natural_language_text)
 
-    def _parse_and_validate_formulas(self, formulas_text: str, original_text: str) -> list:
+    def formalize_stream(self, natural_language_text: str):
         """
-        Строго парсит и валидирует формулы согласно промту
+        Потоковая формализация: выдает каждую формулу, как только она полностью получена и валидна
+        Закрытие генератора (close) прерывает генерацию модели
         """
-        formulas_text = formulas_text.strip()
+        print(f"🔍 Модуль 1 (Формализатор, поток): {natural_language_text}")
 
-        # УДАЛЯЕМ ВСЕ ЛИШНЕЕ - только формулы!
-        lines = formulas_text.split('\n')
-        valid_formulas = []
+        emitted = 0
+        buffer = ""
+        stream = None
+        usage = {}
+        self.stream_finished = False  # True, когда модель выдала ответ до конца (генерация не прервана)
+        self.used_fallback = False
+        started = time.perf_counter()
+        try:
+            stream = self.backend.stream_chat(
+                model=self.model,
+                messages=self._build_messages(natural_language_text),
+                options=self.options,
+                usage=usage
+            )
+            # Формулы из фрагмента выдаются при получении следующего: так после последней формулы
+            # уже известно, закончился ли ответ (задержка — один фрагмент, около токена)
+            pending = []
+            for chunk in stream:
+                for formula in pending:
+                    emitted += 1
+                    yield formula
+                buffer += chunk
+                parts, buffer = self._split_complete_formulas(buffer)
+                pending = self._valid_formulas(parts)
+            self.stream_finished = True
+
+            for formula in pending + self._valid_formulas([buffer]):
+                emitted += 1
+                yield formula
 
-        for line in lines:
-            line = line.strip()
+        except Exception as e:
+            print(f"❌ Модуль 1: Ошибка при потоковой работе с моделью: {e}")
+
+        finally:
+            if stream is not None:
+                stream.close()
+                # При отмене счетчики токенов обычно неизвестны: учитываются только время и то, что пришло
+                self._record_usage(usage, started)
 
-            # Пропускаем пустые строки и комментарии
-            if not line or line.startswith(('Объяснение', 'Пример', 'Вход', 'Вывод', '#')):
+        if not emitted:
+            print("⚠️  Модель не выдала валидных формул, использую улучшенный fallback")
+            yield from self._get_enhanced_fallback_formulas(natural_language_text)
+
+    def _split_complete_formulas(self, buffer: str) -> tuple:
+        """
+        Делит текст по запятым и переводам строк вне скобок (общий разбор для потока и полного ответа)
+        Возвращает (завершенные фрагменты, незавершенный остаток)
+        """
+        parts = []
+        depth = 0
+        start = 0
+        for i, char in enumerate(buffer):
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth = max(0, depth - 1)
+            elif char in ',\n' and depth == 0:
+                parts.append(buffer[start:i])
+                start = i + 1
+        return parts, buffer[start:]
+
+    def _valid_formulas(self, parts: list) -> list:
+        """Очищает фрагменты ответа: убирает маркеры списков и комментарии, оставляет валидные формулы"""
+        formulas = []
+        for part in parts:
+            formula = self._remove_list_markers(part.strip())
+            if not formula or formula.startswith(('Объяснение', 'Пример', 'Вход', 'Вывод', '#')):
                 continue
+            if self._is_valid_predicate_logic(formula):
+                formulas.append(formula)
+        return formulas
+
+    def _build_messages(self, natural_language_text: str) -> list:
+        """Формирует сообщения для модели"""
+        return [
+            {
+                "role": "system",
+                "content": self.system_prompt  # ✅ Общие инструкции
+            },
+            {
+                "role": "user",
+                "content": f"Преобразуй этот русский текст в формулы логики предикатов: '{natural_language_text}'. Выведи ТОЛЬКО формулы, разделенные запятыми."
+            }
+        ]
 
-            # Удаляем номера и маркеры списка
-            clean_line = self._remove_list_markers(line)
+    def _record_usage(self, response: dict, started: float):
+        """Записывает токены и время вызова модели"""
+        self.last_usage = self.usage_tracker.record("formalizer", self.prompt_variant, response,
+                                                    (time.perf_counter() - started) * 1000)
+        print(f"📊 Токены: промт {self.last_usage['prompt_tokens']}, ответ {self.last_usage['completion_tokens']}")
 
-            # Разделяем по запятым и проверяем каждую формулу
-            parts = clean_line.split(',')
-            for part in parts:
-                formula = part.strip()
-                if self._is_valid_predicate_logic(formula):
-                    valid_formulas.append(formula)
+    def _process_response(self, response, natural_language_text: str) -> list:
+        """Извлекает формулы из ответа модели"""
+        formulas_text = response['message']['content'].strip()
+        print(f"📝 Сырой ответ модели: {formulas_text}")
+
+        # Строгая проверка и очистка вывода
+        formulas = self._parse_and_validate_formulas(formulas_text, natural_language_text)
+
+        print(f"✅ Модуль 1: Успешно преобразовал в {len(formulas)} логических формул(ы)")
+        return formulas
+
+    def _parse_and_validate_formulas(self, formulas_text: str, original_text: str) -> list:
+        """
+        Строго парсит и валидирует формулы согласно промту
+        """
+        # УДАЛЯЕМ ВСЕ ЛИШНЕЕ - только формулы!
+        # Разбор тот же, что и в потоковом режиме: запятые внутри скобок не разделяют формулы
+        parts, rest = self._split_complete_formulas(formulas_text.strip())
+        valid_formulas = self._valid_formulas(parts + [rest])
 
         # Если не нашли валидных формул, используем улучшенный fallback
         if not valid_formulas:
@@ -126,6 +234,7 @@ class Formalizer:
         """
         Улучшенный fallback с лучшим анализом русского текста
         """
+        self.used_fallback = True
         text_lower = text.lower()
 
         # Детектируем тип задачи по ключевым словам
@@ -0,0 +1,303 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+
+from config import LLM_BACKEND
+
+# asyncio, urllib.request и библиотека ollama импортируются при первом использовании:
+# модуль подключается при старте GUI и сервера и не должен замедлять запуск
+
+
+class LLMBackend:
+    """
+    Интерфейс LLM-бэкенда
+    chat() возвращает ответ в формате ollama.chat: {"message": {"role", "content"}, "prompt_eval_count", ...}
+    """
+
+    name = "base"
+
+    def chat(self, model: str, messages: list, options: dict = None) -> dict:
+        raise NotImplementedError
+
+    async def achat(self, model: str, messages: list, options: dict = None) -> dict:
+        """Асинхронный вызов; по умолчанию синхронный chat в отдельном потоке"""
+        import asyncio
+
+        return await asyncio.to_thread(self.chat, model, messages, options)
+
+    def stream_chat(self, model: str, messages: list, options: dict = None, usage: dict = None):
+        """
+        Потоковая генерация: итератор фрагментов текста ответа
+        Закрытие итератора (close) прерывает генерацию; по умолчанию весь ответ одним фрагментом
+        usage: словарь, куда записываются поля учета токенов (как в ответе chat), когда бэкенд их сообщает
+        """
+        response = self.chat(model, messages, options)
+        _update_usage(usage, response)
+        yield response["message"]["content"]
+
+
+class OllamaBackend(LLMBackend):
+    """Локальный сервер Ollama через библиотеку ollama"""
+
+    name = "ollama"
+
+    def __init__(self, host: str = None):
+        self.host = host
+        self._client = None
+        self._async_client = None
+
+    def _clients(self) -> tuple:
+        """Клиенты ollama создаются при первом запросе"""
+        if self._client is None:
+            import ollama
+
+            self._async_client = ollama.AsyncClient(host=self.host)
+            self._client = ollama.Client(host=self.host)
+        return self._client, self._async_client
+
+    def chat(self, model: str, messages: list, options: dict = None) -> dict:
+        client, _ = self._clients()
+        return _to_dict(client.chat(model=model, messages=messages, options=options))
+
+    async def achat(self, model: str, messages: list, options: dict = None) -> dict:
+        _, async_client = self._clients()
+        return _to_dict(await async_client.chat(model=model, messages=messages, options=options))
+
+    def stream_chat(self, model: str, messages: list, options: dict = None, usage: dict = None):
+        client, _ = self._clients()
+        stream = client.chat(model=model, messages=messages, options=options, stream=True)
+        try:
+            for chunk in stream:
+                if chunk["done"]:
+                    _update_usage(usage, _to_dict(chunk))  # Счетчики токенов приходят в последнем фрагменте
+                yield chunk["message"]["content"]
+        finally:
+            stream.close()  # Закрывает HTTP-ответ: Ollama прекращает генерацию
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """
+    Любой локальный сервер с OpenAI-совместимым API (/v1/chat/completions):
+    llama.cpp server, vLLM, LM Studio и т.п.
+    """
+
+    name = "openai"
+
+    # Опции Ollama, у которых есть аналог в OpenAI API
+    OPTION_NAMES = {"temperature": "temperature", "top_p": "top_p", "num_predict": "max_tokens"}
+
+    def __init__(self, base_url: str = "http://localhost:8000/v1", api_key: str = "", timeout: float = 120.0):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def _request(self, model: str, messages: list, options: dict, stream: bool):
+        import urllib.request
+
+        payload = {"model": model, "messages": messages, "stream": stream}
+        if stream:
+            payload["stream_options"] = {"include_usage": True}  # Учет токенов в последнем событии потока
+        for option, value in (options or {}).items():
+            if option in self.OPTION_NAMES:
+                payload[self.OPTION_NAMES[option]] = value
+
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        return urllib.request.Request(f"{self.base_url}/chat/completions",
+                                      data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                                      headers=headers, method="POST")
+
+    def chat(self, model: str, messages: list, options: dict = None) -> dict:
+        import urllib.request
+
+        request = self._request(model, messages, options, stream=False)
+        started = time.perf_counter()
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            data = json.loads(response.read().decode("utf-8"))
+        elapsed_ns = int((time.perf_counter() - started) * 1e9)
+
+        usage = data.get("usage") or {}
+        return {
+            "model": data.get("model", model),
+            "message": data["choices"][0]["message"],
+            "prompt_eval_count": usage.get("prompt_tokens"),
+            "eval_count": usage.get("completion_tokens"),
+            "total_duration": elapsed_ns
+        }
+
+    def stream_chat(self, model: str, messages: list, options: dict = None, usage: dict = None):
+        import urllib.request
+
+        request = self._request(model, messages, options, stream=True)
+        # Ответ приходит как server-sent events: "data: {...}"; закрытие соединения прерывает генерацию
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            for line in response:
+                line = line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                if event.get("usage"):
+                    _update_usage(usage, {"prompt_eval_count": event["usage"].get("prompt_tokens"),
+                                          "eval_count": event["usage"].get("completion_tokens")})
+                choices = event.get("choices") or []
+                content = choices[0].get("delta", {}).get("content") if choices else None
+                if content:
+                    yield content
+
+
+class RecordReplayBackend(LLMBackend):
+    """
+    Запись и воспроизведение ответов LLM (JSONL-файл)
+    mode="record": проксирует запросы во внутренний бэкенд и сохраняет ответы
+    mode="replay": отдает сохраненные ответы с синтетической задержкой,
+                   latency + per_token_latency * eval_count
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str, mode: str = "replay", inner: LLMBackend = None,
+                 latency: float = 0.0, per_token_latency: float = 0.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Неизвестный режим '{mode}', ожидается record или replay")
+        if mode == "record" and inner is None:
+            raise ValueError("Для режима record нужен внутренний бэкенд")
+
+        self.path = path
+        self.mode = mode
+        self.name = mode
+        self.inner = inner
+        self.latency = latency
+        self.per_token_latency = per_token_latency
+        self._lock = threading.Lock()
+        self.recordings = self._load()
+
+    def _load(self) -> dict:
+        recordings = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        recordings[entry["key"]] = entry["response"]
+        elif self.mode == "replay":
+            raise FileNotFoundError(f"Файл записей LLM не найден: {self.path}")
+        return recordings
+
+    @staticmethod
+    def request_key(model: str, messages: list, options: dict = None) -> str:
+        """Ключ запроса: хеш модели, сообщений и опций"""
+        raw = json.dumps({"model": model, "messages": messages, "options": options or {}},
+                         ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def chat(self, model: str, messages: list, options: dict = None) -> dict:
+        key = self.request_key(model, messages, options)
+
+        if self.mode == "record":
+            response = self.inner.chat(model, messages, options)
+            self._save(key, model, response)
+            return response
+
+        response = self._lookup(key)
+        time.sleep(self._delay(response))
+        return response
+
+    async def achat(self, model: str, messages: list, options: dict = None) -> dict:
+        import asyncio
+
+        if self.mode == "record":
+            return await super().achat(model, messages, options)
+
+        response = self._lookup(self.request_key(model, messages, options))
+        await asyncio.sleep(self._delay(response))
+        return response
+
+    def stream_chat(self, model: str, messages: list, options: dict = None, usage: dict = None):
+        key = self.request_key(model, messages, options)
+
+        if self.mode == "record":
+            # Сохраняем только полностью полученные ответы
+            chunks = []
+            inner_usage = {}
+            for chunk in self.inner.stream_chat(model, messages, options, usage=inner_usage):
+                chunks.append(chunk)
+                yield chunk
+            _update_usage(usage, inner_usage)
+            self._save(key, model, dict(inner_usage, model=model,
+                                        message={"role": "assistant", "content": "".join(chunks)}))
+            return
+
+        # Воспроизведение по ~4 символа (около токена) с той же суммарной задержкой, что и у chat
+        response = self._lookup(key)
+        _update_usage(usage, response)
+        content = response["message"]["content"]
+        pieces = max(1, math.ceil(len(content) / 4))
+        piece_delay = (self._delay(response) - self.latency) / pieces
+
+        time.sleep(self.latency)
+        for i in range(pieces):
+            time.sleep(piece_delay)
+            yield content[i * 4:(i + 1) * 4]
+
+    def _lookup(self, key: str) -> dict:
+        if key not in self.recordings:
+            raise KeyError(f"В {self.path} нет записи для запроса {key[:12]}")
+        return self.recordings[key]
+
+    def _delay(self, response: dict) -> float:
+        tokens = response.get("eval_count") or len(response["message"]["content"]) // 4
+        return self.latency + self.per_token_latency * tokens
+
+    def _save(self, key: str, model: str, response: dict):
+        with self._lock:
+            self.recordings[key] = response
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "model": model, "response": response}, ensure_ascii=False) + "\n")
+
+
+USAGE_FIELDS = ("prompt_eval_count", "eval_count", "prompt_eval_duration", "eval_duration")
+
+
+def _update_usage(usage: dict, response: dict):
+    """Копирует известные поля учета токенов из ответа в usage (если usage передан)"""
+    if usage is None:
+        return
+    for field in USAGE_FIELDS:
+        if response.get(field) is not None:
+            usage[field] = response[field]
+
+
+def _to_dict(response) -> dict:
+    """Приводит ответ библиотеки ollama (dict или pydantic-модель) к обычному словарю"""
+    if isinstance(response, dict):
+        return response
+    return response.model_dump()
+
+
+def create_backend(settings: dict = None) -> LLMBackend:
+    """Создает бэкенд по настройкам LLM_BACKEND из config.py (с возможностью переопределения)"""
+    settings = dict(LLM_BACKEND, **(settings or {}))
+    backend_type = settings["type"]
+
+    if backend_type == "ollama":
+        return OllamaBackend(settings["ollama_host"])
+    if backend_type == "openai":
+        return OpenAICompatibleBackend(settings["openai_base_url"], settings["openai_api_key"],
+                                       timeout=settings["timeout"])
+    if backend_type in ("record", "replay"):
+        inner = None
+        if backend_type == "record":
+            inner = create_backend(dict(settings, type=settings["record_backend"]))
+        return RecordReplayBackend(settings["replay_file"], mode=backend_type, inner=inner,
+                                   latency=settings["replay_latency"],
+                                   per_token_latency=settings["replay_per_token_latency"])
+
+    raise ValueError(f"Неизвестный тип LLM-бэкенда: {backend_type}")
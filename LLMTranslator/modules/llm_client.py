@@ -0,0 +1,28 @@
+import asyncio
+
+from modules.llm_backends import LLMBackend
+
+
+class AsyncLLMClient:
+    """
+    Асинхронный клиент поверх LLM-бэкенда с ограничением числа одновременных запросов
+    """
+
+    def __init__(self, backend: LLMBackend, max_concurrency: int = 4, timeout: float = 120.0):
+        self.backend = backend
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+
+    async def chat(self, model: str, messages: list, options: dict = None) -> dict:
+        """
+        Отправляет запрос к модели; формат ответа совпадает с ollama.chat
+        Не более max_concurrency запросов выполняются одновременно, остальные ждут
+        """
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                return await asyncio.wait_for(self.backend.achat(model, messages, options), self.timeout)
+            finally:
+                self.in_flight -= 1
@@ -0,0 +1,62 @@
+import threading
+
+
+class UsageTracker:
+    """
+    Учет токенов и времени каждого вызова LLM
+    Данные берутся из ответа бэкенда (поля Ollama: prompt_eval_count, eval_count,
+    prompt_eval_duration, eval_duration в наносекундах)
+    """
+
+    def __init__(self, max_records: int = 10000):
+        self.max_records = max_records
+        self.records = []
+        self._lock = threading.Lock()
+
+    def record(self, module: str, prompt_variant: str, response: dict, wall_ms: float) -> dict:
+        """Сохраняет учет одного вызова и возвращает его"""
+        usage = {
+            "module": module,
+            "prompt_variant": prompt_variant,
+            "prompt_tokens": response.get("prompt_eval_count"),
+            "completion_tokens": response.get("eval_count"),
+            "prompt_eval_ms": _ns_to_ms(response.get("prompt_eval_duration")),
+            "decode_ms": _ns_to_ms(response.get("eval_duration")),
+            "wall_ms": round(wall_ms, 2)
+        }
+        with self._lock:
+            self.records.append(usage)
+            if len(self.records) > self.max_records:
+                del self.records[:len(self.records) - self.max_records]
+        return usage
+
+    def summary(self) -> dict:
+        """Суммы и средние по парам (модуль, вариант промта)"""
+        with self._lock:
+            records = list(self.records)
+
+        groups = {}
+        for usage in records:
+            group = groups.setdefault(f"{usage['module']}/{usage['prompt_variant']}", {"calls": 0})
+            group["calls"] += 1
+            for field in ("prompt_tokens", "completion_tokens", "prompt_eval_ms", "decode_ms", "wall_ms"):
+                if usage[field] is not None:
+                    group[field] = group.get(field, 0) + usage[field]
+
+        for group in groups.values():
+            for field in ("prompt_eval_ms", "decode_ms", "wall_ms"):
+                if field in group:
+                    group[f"avg_{field}"] = round(group[field] / group["calls"], 2)
+        return groups
+
+    def reset(self):
+        with self._lock:
+            self.records = []
+
+
+def _ns_to_ms(value) -> float:
+    return round(value / 1e6, 2) if value is not None else None
+
+
+# Общий учет для всех модулей процесса
+USAGE_TRACKER = UsageTracker()
@@ -0,0 +1,206 @@
+import heapq
+import multiprocessing
+import os
+from typing import Dict, List, Tuple
+
+from modules.resolution_engine import ResolutionEngine
+
+
+class ParallelResolutionEngine(ResolutionEngine):
+    """
+    Движок резолюций с параллельной генерацией резольвент внутри одного доказательства
+    Рабочие процессы держат шарды множества клауз (шард выбирается по предикату первого литерала)
+    и для каждой выбранной клаузы возвращают закодированные резольвенты со своими клаузами.
+    Дедупликация, проверка на ◻ и очереди остаются в координаторе и идут в том же порядке,
+    что и в последовательном движке, поэтому результат совпадает с ResolutionEngine при тех же лимитах
+    """
+
+    def __init__(self, workers: int = None, min_clauses: int = 200, **kwargs):
+        """
+        workers: число рабочих процессов (по умолчанию по числу ядер)
+        min_clauses: пока клауз меньше, выбранная клауза обрабатывается в координаторе без пересылки
+        Остальные параметры — как у ResolutionEngine
+        """
+        super().__init__(**kwargs)
+        self.workers = workers or os.cpu_count() or 1
+        self.min_clauses = min_clauses
+        self._strategy = {"ordering": self.ordering, "selection": self.selection,
+                          "ur_resolution": self.ur_resolution}
+        self._connections = []
+        self._processes = []
+
+    def close(self):
+        """Останавливает рабочие процессы"""
+        for connection in self._connections:
+            try:
+                connection.send(None)
+                connection.close()
+            except (OSError, EOFError):
+                pass
+        for process in self._processes:
+            process.join(timeout=1)
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start_workers(self):
+        """Запускает рабочие процессы заранее (иначе они стартуют при первом параллельном шаге)"""
+        if self._processes:
+            return
+        for _ in range(self.workers):
+            parent_end, child_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker, args=(child_end, self._strategy), daemon=True)
+            process.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._processes.append(process)
+
+    def _reset_search(self, clauses: List[List[Tuple]]):
+        super()._reset_search(clauses)
+        # Таблица символов и шарды строятся заново для каждого доказательства
+        self._symbols = []
+        self._symbol_ids = {}
+        self._shard_of_predicate = {}
+        self._synced = 0  # Сколько клауз из all_clauses уже разослано по шардам
+        self._sent_symbols = 0
+        self._reset_pending = True
+
+    def _process_given(self, current: List[Tuple], units_only: bool) -> bool:
+        """Как в ResolutionEngine, но резольвенты с уже имеющимися клаузами считают рабочие процессы"""
+        if len(self.all_clauses) < self.min_clauses:
+            return super()._process_given(current, units_only)
+
+        limit = len(self.all_clauses)
+        for position, resolvents in self._parallel_inferences(current, limit, units_only):
+            existing = self.all_clauses[position]
+            for resolvent in resolvents:
+                if self._add_resolvent(resolvent, (current, existing)):
+                    return True
+
+        # Резольвенты с клаузами, полученными на этом шаге, считаются в координаторе, как в ResolutionEngine
+        position = limit
+        while not units_only and position < len(self.all_clauses):
+            if self._resolve_with(current, self.all_clauses[position]):
+                return True
+            position += 1
+
+        if self.ur_resolution:
+            return self._ur_step(current)
+        return False
+
+    def _parallel_inferences(self, current: List[Tuple], limit: int, units_only: bool):
+        """Рассылает выбранную клаузу по шардам; резольвенты в порядке позиций партнеров в all_clauses"""
+        self.start_workers()
+
+        new_clauses = [[] for _ in self._connections]
+        for position in range(self._synced, limit):
+            clause = self.all_clauses[position]
+            new_clauses[self._shard(clause)].append((position, self._encode(clause)))
+        self._synced = limit
+
+        encoded_current = self._encode(current)
+        new_symbols = self._symbols[self._sent_symbols:]
+        self._sent_symbols = len(self._symbols)
+
+        for connection, shard_clauses in zip(self._connections, new_clauses):
+            connection.send((self._reset_pending, new_symbols, shard_clauses, encoded_current, limit, units_only))
+        self._reset_pending = False
+
+        replies = [connection.recv() for connection in self._connections]
+        for position, encoded_resolvents in heapq.merge(*replies, key=lambda reply: reply[0]):
+            yield position, [self._decode(encoded) for encoded in encoded_resolvents]
+
+    def _shard(self, clause: List[Tuple]) -> int:
+        # Предикаты раздаются шардам по кругу в порядке появления: детерминированно и равномерно
+        predicate = clause[0][0]
+        if predicate not in self._shard_of_predicate:
+            self._shard_of_predicate[predicate] = len(self._shard_of_predicate) % len(self._connections)
+        return self._shard_of_predicate[predicate]
+
+    def _symbol_id(self, symbol: str) -> int:
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return symbol_id
+
+    def _encode(self, clause: List[Tuple]) -> tuple:
+        return _encode_clause(clause, self._symbol_id)
+
+    def _decode(self, encoded: tuple) -> List[Tuple]:
+        return _decode_clause(encoded, self._symbols)
+
+
+def _encode_clause(clause: List[Tuple], symbol_id) -> tuple:
+    """Компактная форма клаузы для пересылки: символы заменены номерами из общей таблицы"""
+    return tuple((symbol_id(pred), tuple(symbol_id(arg) for arg in args), neg) for pred, args, neg in clause)
+
+
+def _decode_clause(encoded: tuple, symbols: List[str]) -> List[Tuple]:
+    return [(symbols[pred], [symbols[arg] for arg in args], neg) for pred, args, neg in encoded]
+
+
+def _shard_worker(connection, strategy: Dict):
+    """
+    Рабочий процесс: хранит свой шард клауз с индексом по (предикат, знак)
+    Сообщение: (сброс, новые символы, новые клаузы шарда, выбранная клауза, граница позиций, только единичные)
+    Ответ: [(позиция партнера, [закодированные резольвенты]), ...] по возрастанию позиций
+    """
+    engine = ResolutionEngine(verbose=False, **strategy)
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+
+        reset, new_symbols, new_clauses, encoded_current, limit, units_only = message
+        if reset:
+            symbols, symbol_ids = [], {}
+            clauses = {}
+            literal_index = {}  # (предикат, знак) -> позиции клауз шарда с таким литералом
+            given_clauses = []  # Держим выбранные клаузы живыми: кеш допустимых литералов движка идет по id
+            engine._eligible_cache = {}
+
+        for symbol in new_symbols:
+            symbol_ids[symbol] = len(symbols)
+            symbols.append(symbol)
+
+        for position, encoded in new_clauses:
+            clause = _decode_clause(encoded, symbols)
+            clauses[position] = clause
+            for pred, _, neg in clause:
+                positions = literal_index.setdefault((pred, neg), [])
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+
+        current = _decode_clause(encoded_current, symbols)
+        given_clauses.append(current)
+
+        # Резольвента возможна только с клаузой, где есть тот же предикат с противоположным знаком
+        partners = set()
+        for pred, _, neg in current:
+            partners.update(literal_index.get((pred, not neg), ()))
+
+        reply = []
+        for position in sorted(partners):
+            if position >= limit:
+                continue
+            existing = clauses[position]
+            if units_only and len(existing) != 1:
+                continue
+            if current == existing:
+                continue
+            if engine.ur_resolution and engine._covered_by_ur(current, existing):
+                continue
+
+            resolvents = engine._inferences(current, existing)
+            if resolvents:
+                reply.append((position, [_encode_clause(r, symbol_ids.__getitem__) for r in resolvents]))
+        connection.send(reply)
@@ -2,22 +2,55 @@ import re
 from typing import List, Tuple, Dict, Set
 from collections import deque
 
+from modules.term_ordering import KBOrdering
+
 
 class ResolutionEngine:
     """
     МОДУЛЬ 2: Улучшенный движок резолюций с приоритетом единичных клауз
+    Опционально: упорядоченная резолюция с выбором литералов и UR-резолюция
     """
 
-    def __init__(self):
+    def __init__(self, max_steps: int = 50, step_callback=None, verbose: bool = True,
+                 ordering=None, selection: str = None, ur_resolution: bool = False, max_clauses: int = None):
+        """
+        ordering: упорядочение литералов для упорядоченной резолюции: "kbo" или объект KBOrdering
+        selection: функция выбора литералов; "negative" — резолюция только по выбранному отрицательному литералу
+                   Вывод становится прямым (от фактов): отрицание цели не раскручивает правила назад,
+                   поэтому на задачах с лишними константами клауз генерируется больше, чем в базовой стратегии
+        ur_resolution: дополнительно выполнять UR-резолюцию (ядро против единичных клауз за один шаг)
+        max_clauses: лимит размера множества клауз (None — без лимита); при достижении новые клаузы
+                     не добавляются и поиск останавливается, как по лимиту шагов
+        """
+        if selection not in (None, "negative"):
+            raise ValueError(f"Неизвестная функция выбора литералов: {selection}")
+        if ordering == "kbo":
+            ordering = KBOrdering()
+        elif ordering is not None and not isinstance(ordering, KBOrdering):
+            raise ValueError(f"Неизвестное упорядочение: {ordering}")
+
         self.steps_log = []
         self.step_number = 0
+        self.max_steps = max_steps
+        self.max_clauses = max_clauses
+        self.ordering = ordering
+        self.selection = selection
+        self.ur_resolution = ur_resolution
+        self._eligible_cache = {}
+        self.derivations = {}
+        self.refutation = None  # Вывод ◻ последнего успешного доказательства
+        self.step_callback = step_callback  # Вызывается для каждого шага (например, для потокового вывода в GUI)
+        self.verbose = verbose
 
     def _log_step(self, message: str):
         """Логирует шаг доказательства"""
         self.step_number += 1
         step_msg = f"Шаг {self.step_number}: {message}"
         self.steps_log.append(step_msg)
-        print(f"⚡ {step_msg}")
+        if self.step_callback is not None:
+            self.step_callback(step_msg)
+        if self.verbose:
+            print(f"⚡ {step_msg}")
 
     def parse_formula(self, formula: str) -> List[Tuple]:
         """
@@ -107,24 +140,128 @@ class ResolutionEngine:
                 if pred1 == pred2 and neg1 != neg2:
                     substitution = self.unify(args1, args2)
                     if substitution is not None:
-                        # Создаем резольвенту
-                        new_clause = []
-
-                        # Добавляем литералы из clause1 кроме i-го
-                        for k, lit in enumerate(clause1):
-                            if k != i:
-                                new_clause.append(lit)
-
-                        # Добавляем литералы из clause2 кроме j-го
-                        for k, lit in enumerate(clause2):
-                            if k != j:
-                                # Проверяем на дубликаты
-                                if lit not in new_clause:
-                                    new_clause.append(lit)
-
-                        # Применяем подстановку
-                        resolved = self.apply_substitution(new_clause, substitution)
-                        return resolved
+                        return self._build_resolvent(clause1, i, clause2, j, substitution)
+        return None
+
+    def _build_resolvent(self, clause1: List[Tuple], i: int, clause2: List[Tuple], j: int,
+                         substitution: Dict) -> List[Tuple]:
+        """Создает резольвенту по литералу i клаузы clause1 и литералу j клаузы clause2"""
+        new_clause = []
+
+        # Добавляем литералы из clause1 кроме i-го
+        for k, lit in enumerate(clause1):
+            if k != i:
+                new_clause.append(lit)
+
+        # Добавляем литералы из clause2 кроме j-го
+        for k, lit in enumerate(clause2):
+            if k != j:
+                # Проверяем на дубликаты
+                if lit not in new_clause:
+                    new_clause.append(lit)
+
+        # Применяем подстановку
+        return self.apply_substitution(new_clause, substitution)
+
+    def _eligible_literals(self, clause: List[Tuple]) -> List[int]:
+        """
+        Индексы литералов, по которым разрешена резолюция:
+        выбранный отрицательный литерал, иначе максимальные в упорядочении литералы
+        """
+        # Клаузы не изменяются и живут до конца поиска, поэтому кешируем по id
+        cached = self._eligible_cache.get(id(clause))
+        if cached is not None:
+            return cached
+        eligible = self._compute_eligible_literals(clause)
+        self._eligible_cache[id(clause)] = eligible
+        return eligible
+
+    def _compute_eligible_literals(self, clause: List[Tuple]) -> List[int]:
+        if self.selection == "negative":
+            negatives = [i for i, (_, _, neg) in enumerate(clause) if neg]
+            if negatives:
+                if self.ordering is not None:
+                    # Выбираем самый тяжелый отрицательный литерал (первый при равенстве)
+                    return [max(negatives, key=lambda i: (self.ordering.weight(clause[i]), -i))]
+                return [negatives[0]]
+
+        if self.ordering is not None:
+            return [i for i, lit in enumerate(clause)
+                    if not any(self.ordering.greater(other, lit) for j, other in enumerate(clause) if j != i)]
+
+        return list(range(len(clause)))
+
+    def _resolvents(self, clause1: List[Tuple], clause2: List[Tuple]) -> List[List[Tuple]]:
+        """Все резольвенты двух клауз по разрешенным литералам (упорядоченная резолюция)"""
+        resolvents = []
+        eligible2 = self._eligible_literals(clause2)
+        for i in self._eligible_literals(clause1):
+            pred1, args1, neg1 = clause1[i]
+            for j in eligible2:
+                pred2, args2, neg2 = clause2[j]
+                if pred1 == pred2 and neg1 != neg2:
+                    substitution = self.unify(args1, args2)
+                    if substitution is not None:
+                        resolvents.append(self._build_resolvent(clause1, i, clause2, j, substitution))
+        return resolvents
+
+    def _inferences(self, clause1: List[Tuple], clause2: List[Tuple]) -> List[List[Tuple]]:
+        """Резольвенты пары клауз с учетом выбранной стратегии"""
+        if self.ordering is None and self.selection is None:
+            resolvent = self._resolve(clause1, clause2)
+            return [] if resolvent is None else [resolvent]
+        return self._resolvents(clause1, clause2)
+
+    def _ur_resolve(self, nucleus: List[Tuple], units: List[List[Tuple]], required: List[Tuple] = None) -> List[Tuple]:
+        """
+        UR-резолюция: разрешает все литералы ядра, кроме одного (или все), с единичными клаузами за один шаг
+        required: единичная клауза, которая обязана быть среди сателлитов (новая выбранная клауза)
+        Возвращает список пар (результат, использованные единичные клаузы)
+        """
+        # Стартовые варианты: (индекс литерала, закрытого required, подстановка)
+        starts = [(None, {})]
+        if required is not None:
+            req_pred, req_args, req_neg = required[0]
+            starts = []
+            for k, (pred, args, neg) in enumerate(nucleus):
+                if pred == req_pred and neg != req_neg:
+                    unifier = self.unify(args, req_args)
+                    if unifier is not None:
+                        starts.append((k, unifier))
+
+        results = []
+        for fixed, start_substitution in starts:
+            for keep in [None] + [k for k in range(len(nucleus)) if k != fixed]:
+                literals = [lit for k, lit in enumerate(nucleus) if k != keep and k != fixed]
+                match = self._match_satellites(literals, units, start_substitution)
+                if match is None:
+                    continue
+                substitution, satellites = match
+                if fixed is not None:
+                    satellites = [required] + satellites
+                resolvent = [] if keep is None else self.apply_substitution([nucleus[keep]], substitution)
+                results.append((resolvent, satellites))
+                if keep is None:
+                    return results  # Противоречие найдено, остальные варианты не нужны
+        return results
+
+    def _match_satellites(self, literals: List[Tuple], units: List[List[Tuple]], substitution: Dict):
+        """Подбирает для каждого литерала комплементарную единичную клаузу (с возвратом)"""
+        if not literals:
+            return substitution, []
+
+        pred, args, neg = literals[0]
+        args = [substitution.get(arg, arg) for arg in args]
+        for unit in units:
+            unit_pred, unit_args, unit_neg = unit[0]
+            if unit_pred != pred or unit_neg == neg:
+                continue
+            unifier = self.unify(args, unit_args)
+            if unifier is None:
+                continue
+            match = self._match_satellites(literals[1:], units, dict(substitution, **unifier))
+            if match is not None:
+                return match[0], [unit] + match[1]
         return None
 
     def _clause_to_str(self, clause: List[Tuple]) -> str:
@@ -145,91 +282,283 @@ class ResolutionEngine:
         """
         Улучшенный алгоритм доказательства методом резолюций с приоритетом единичных клауз
         """
-        print("🧮 Модуль 2: Начинаю формальное доказательство...")
+        if self.verbose:
+            print("🧮 Модуль 2: Начинаю формальное доказательство...")
         self.steps_log = []
         self.step_number = 0
+        self.derivations = {}
+        self.refutation = None
 
         # Парсинг всех формул
         clauses = []
         for formula in formulas:
-            try:
-                parsed = self.parse_formula(formula)
-                if isinstance(parsed[0], list):  # Если вернулся список клауз
-                    clauses.extend(parsed)
-                else:  # Если вернулась одна клауза
-                    clauses.append(parsed)
-                self._log_step(f"Добавлена клауза: {self._clause_to_str(parsed)}")
-            except Exception as e:
-                self._log_step(f"Ошибка парсинга формулы '{formula}': {e}")
+            clauses.extend(self._parse_formula_clauses(formula))
 
         if not clauses:
             self._log_step("Нет корректных клауз для доказательства")
             return False, self.steps_log
 
+        self._start_search(clauses)
+        if self._saturate(self.max_steps):
+            return True, self.steps_log
+
+        if self._clause_limit_reached():
+            self._log_step(f"Достигнут лимит в {self.max_clauses} клауз. Противоречие не найдено.")
+        else:
+            self._log_step(f"Достигнут лимит в {self.max_steps} шагов. Противоречие не найдено.")
+        self._log_step(f"Всего обработано клауз: {len(self.all_clauses)}")
+        return False, self.steps_log
+
+    def start_incremental(self):
+        """
+        Начинает инкрементальное доказательство: формулы поступают по одной через add_formula
+        (например, по мере потоковой генерации формализатора)
+        """
+        if self.verbose:
+            print("🧮 Модуль 2: Начинаю инкрементальное доказательство...")
+        self.steps_log = []
+        self.step_number = 0
+        self._reset_search([])
+        self.proved = False
+
+    def add_formula(self, formula: str) -> bool:
+        """
+        Добавляет формулу и насыщает множество клауз (max_steps — общий лимит шагов на все доказательство, как в prove)
+        Возвращает True, как только найдено противоречие
+        """
+        if self.proved:
+            return True
+
+        for clause in self._parse_formula_clauses(formula):
+            clause_str = self._clause_to_str(clause)
+            if clause_str in self.all_clauses_set:
+                continue
+            self.all_clauses_set.add(clause_str)
+            self.all_clauses.append(clause)
+            self._index_clause(clause)
+            if self._is_unit_clause(clause):
+                self.unit_queue.appendleft(clause)
+            else:
+                self.non_unit_queue.append(clause)
+
+        self.proved = self._saturate(self.max_steps)
+        return self.proved
+
+    def finish_incremental(self) -> Tuple[bool, List[str]]:
+        """Завершает инкрементальное доказательство и возвращает результат как prove"""
+        if not self.proved:
+            if not self.all_clauses:
+                self._log_step("Нет корректных клауз для доказательства")
+            else:
+                self._log_step("Очереди исчерпаны или достигнут лимит шагов. Противоречие не найдено.")
+                self._log_step(f"Всего обработано клауз: {len(self.all_clauses)}")
+        return self.proved, self.steps_log
+
+    def _parse_formula_clauses(self, formula: str) -> List[List[Tuple]]:
+        """Парсит формулу в список клауз с записью в лог"""
+        try:
+            parsed = self.parse_formula(formula)
+            self._log_step(f"Добавлена клауза: {self._clause_to_str(parsed)}")
+            if isinstance(parsed[0], list):  # Если вернулся список клауз
+                return parsed
+            return [parsed]  # Если вернулась одна клауза
+        except Exception as e:
+            self._log_step(f"Ошибка парсинга формулы '{formula}': {e}")
+            return []
+
+    def _start_search(self, clauses: List[List[Tuple]]):
+        """Готовит очереди и множество клауз для поиска"""
+        unit_count = sum(1 for c in clauses if self._is_unit_clause(c))
+        self._log_step(f"Найдено {unit_count} единичных и {len(clauses) - unit_count} составных клауз")
+        self._reset_search(clauses)
+
+    def _reset_search(self, clauses: List[List[Tuple]]):
+        """Сбрасывает очереди, множество клауз и счетчики поиска"""
         # Разделяем клаузы на единичные и составные
         unit_clauses = [c for c in clauses if self._is_unit_clause(c)]
         non_unit_clauses = [c for c in clauses if not self._is_unit_clause(c)]
 
-        self._log_step(f"Найдено {len(unit_clauses)} единичных и {len(non_unit_clauses)} составных клауз")
-
         # Создаем очереди с приоритетом для единичных клауз
-        new_unit_queue = deque(unit_clauses)
-        new_non_unit_queue = deque(non_unit_clauses)
-
-        all_clauses = clauses.copy()
-        all_clauses_set = set(self._clause_to_str(c) for c in clauses)
-
-        max_steps = 50
-        steps = 0
-
-        while (new_unit_queue or new_non_unit_queue) and steps < max_steps:
-            steps += 1
-
-            # ПРИОРИТЕТ 1: Сначала берем единичные клаузы
-            if new_unit_queue:
-                current = new_unit_queue.popleft()
-                clauses_to_check = all_clauses  # Проверяем со всеми клаузами
-            elif new_non_unit_queue:
-                current = new_non_unit_queue.popleft()
-                # Для составных клауз проверяем только с единичными (стратегия unit preference)
-                clauses_to_check = [c for c in all_clauses if self._is_unit_clause(c)]
-                if not clauses_to_check:
-                    clauses_to_check = all_clauses
-            else:
-                break
+        self.unit_queue = deque(unit_clauses)
+        self.non_unit_queue = deque(non_unit_clauses)
 
-            for existing in clauses_to_check:
-                if current == existing:
-                    continue
+        self.all_clauses = []
+        self.all_clauses_set = set(self._clause_to_str(c) for c in clauses)
+        self._literal_index = {}  # (предикат, знак) -> позиции клауз в all_clauses с таким литералом
+        self._unit_count = 0
+        for clause in clauses:
+            self.all_clauses.append(clause)
+            self._index_clause(clause)
+        self.search_steps = 0
+        self.stats = {"generated": 0, "kept": 0}
+        self._eligible_cache = {}
+
+        # Вывод каждой полученной клаузы: строка клаузы -> (правило, родители); у посылок записи нет
+        self.derivations = {}
+        self.refutation = None
+
+    def _saturate(self, step_limit: int) -> bool:
+        """Основной цикл: берет клаузы из очередей, пока не найдено противоречие или не исчерпан лимит"""
+        while ((self.unit_queue or self.non_unit_queue) and self.search_steps < step_limit
+               and not self._clause_limit_reached()):
+            self.search_steps += 1
+
+            current, units_only = self._select_given()
+            if self._process_given(current, units_only):
+                return True
+        return False
+
+    def _clause_limit_reached(self) -> bool:
+        return self.max_clauses is not None and len(self.all_clauses) >= self.max_clauses
+
+    def _select_given(self) -> Tuple[List[Tuple], bool]:
+        """Выбирает следующую клаузу; второй элемент — резольвировать ли ее только с единичными клаузами"""
+        # ПРИОРИТЕТ 1: Сначала берем единичные клаузы
+        if self.unit_queue:
+            return self.unit_queue.popleft(), False  # Проверяем со всеми клаузами
+
+        current = self.non_unit_queue.popleft()
+        if self.ordering is not None or self.selection is not None:
+            # Упорядоченная резолюция сама ограничивает выводы, но требует всех партнеров для полноты
+            return current, False
+        # Для составных клауз проверяем только с единичными (стратегия unit preference)
+        return current, self._unit_count > 0
+
+    def _process_given(self, current: List[Tuple], units_only: bool) -> bool:
+        """Резольвирует выбранную клаузу с партнерами; True, если найдено противоречие"""
+        limit = len(self.all_clauses)
+        for position in self._partner_positions(current, limit, units_only):
+            if self._resolve_with(current, self.all_clauses[position]):
+                return True
+
+        # Клаузы, полученные на этом же шаге, тоже становятся партнерами (кроме режима только единичных)
+        position = limit
+        while not units_only and position < len(self.all_clauses):
+            if self._resolve_with(current, self.all_clauses[position]):
+                return True
+            position += 1
+
+        if self.ur_resolution:
+            return self._ur_step(current)
+        return False
+
+    def _resolve_with(self, current: List[Tuple], existing: List[Tuple]) -> bool:
+        """Добавляет резольвенты пары клауз; True, если получена пустая клауза"""
+        if current == existing:
+            return False
+        if self.ur_resolution and self._covered_by_ur(current, existing):
+            return False
+
+        for resolvent in self._inferences(current, existing):
+            if self._add_resolvent(resolvent, (current, existing)):
+                return True
+        return False
+
+    def _index_clause(self, clause: List[Tuple]):
+        """Записывает в индекс литералов клаузу, только что добавленную в конец all_clauses"""
+        position = len(self.all_clauses) - 1
+        for pred, _, neg in clause:
+            positions = self._literal_index.setdefault((pred, neg), [])
+            if not positions or positions[-1] != position:
+                positions.append(position)
+        if self._is_unit_clause(clause):
+            self._unit_count += 1
+
+    def _partner_positions(self, current: List[Tuple], limit: int, units_only: bool) -> List[int]:
+        """
+        Позиции (меньше limit) клауз, с которыми возможна резольвента: в них есть предикат
+        выбранной клаузы с противоположным знаком. Остальные пары резольвент не дают
+        """
+        positions = set()
+        for pred, _, neg in current:
+            positions.update(self._literal_index.get((pred, not neg), ()))
+        return sorted(position for position in positions if position < limit
+                      and (not units_only or self._is_unit_clause(self.all_clauses[position])))
 
-                resolvent = self._resolve(current, existing)
-                if resolvent is not None:
-                    resolvent_str = self._clause_to_str(resolvent)
-
-                    # ПРОВЕРКА НА ПУСТУЮ КЛАУЗУ (ПРОТИВОРЕЧИЕ)
-                    if not resolvent:
-                        self._log_step(
-                            f"Резолюция: {self._clause_to_str(current)} и {self._clause_to_str(existing)} -> ◻")
-                        self._log_step("🎉 НАЙДЕНО ПРОТИВОРЕЧИЕ! Доказательство завершено.")
-                        return True, self.steps_log
-
-                    # Если это новая клауза, добавляем ее
-                    if resolvent_str not in all_clauses_set:
-                        self._log_step(
-                            f"Резолюция: {self._clause_to_str(current)} и {self._clause_to_str(existing)} -> {resolvent_str}")
-                        all_clauses_set.add(resolvent_str)
-                        all_clauses.append(resolvent)
-
-                        # Добавляем в соответствующую очередь с приоритетом
-                        if self._is_unit_clause(resolvent):
-                            new_unit_queue.appendleft(resolvent)  # Единичные - в начало
-                            self._log_step(f"→ Новая единичная клауза, добавляется в приоритетную очередь")
-                        else:
-                            new_non_unit_queue.append(resolvent)  # Составные - в конец
-
-        self._log_step(f"Достигнут лимит в {max_steps} шагов. Противоречие не найдено.")
-        self._log_step(f"Всего обработано клауз: {len(all_clauses)}")
-        return False, self.steps_log
+    def _covered_by_ur(self, clause1: List[Tuple], clause2: List[Tuple]) -> bool:
+        """
+        Единичная клауза против ядра из 3+ литералов: такие пары закрывает UR-резолюция,
+        бинарная резолюция дала бы только промежуточные клаузы
+        """
+        return (len(clause1) == 1 and len(clause2) > 2) or (len(clause2) == 1 and len(clause1) > 2)
+
+    def _ur_step(self, current: List[Tuple]) -> bool:
+        """UR-резолюция для выбранной клаузы: как ядра (3+ литерала) или как единичной клаузы-сателлита"""
+        units = [c for c in self.all_clauses if self._is_unit_clause(c)]
+        if self._is_unit_clause(current):
+            # Новая единичная клауза: ищем ядра, где она может быть сателлитом
+            pred, _, neg = current[0]
+            nuclei = [c for c in self.all_clauses if len(c) > 2
+                      and any(p == pred and n != neg for p, _, n in c)]
+            required = current
+        elif len(current) > 2:
+            nuclei = [current]
+            required = None
+        else:
+            return False  # Ядра из двух литералов покрывает бинарная резолюция
+
+        for nucleus in nuclei:
+            for resolvent, satellites in self._ur_resolve(nucleus, units, required):
+                if self._add_resolvent(resolvent, [nucleus] + satellites, rule="UR-резолюция"):
+                    return True
+        return False
+
+    def _add_resolvent(self, resolvent: List[Tuple], parents, rule: str = "Резолюция") -> bool:
+        """Добавляет резольвенту в поиск; True, если это пустая клауза (противоречие)"""
+        self.stats["generated"] += 1
+
+        # ПРОВЕРКА НА ПУСТУЮ КЛАУЗУ (ПРОТИВОРЕЧИЕ)
+        if not resolvent:
+            self.refutation = self._extract_refutation(resolvent, rule, list(parents))
+            self._log_step(f"{rule}: {' и '.join(self._clause_to_str(p) for p in parents)} -> ◻")
+            self._log_step("🎉 НАЙДЕНО ПРОТИВОРЕЧИЕ! Доказательство завершено.")
+            return True
+
+        # Множество клауз заполнено: резольвенту отбрасываем, _saturate остановится после шага
+        if self._clause_limit_reached():
+            return False
+
+        # Если это новая клауза, добавляем ее
+        resolvent_str = self._clause_to_str(resolvent)
+        if resolvent_str not in self.all_clauses_set:
+            self._log_step(f"{rule}: {' и '.join(self._clause_to_str(p) for p in parents)} -> {resolvent_str}")
+            self.all_clauses_set.add(resolvent_str)
+            self.all_clauses.append(resolvent)
+            self._index_clause(resolvent)
+            self.derivations[resolvent_str] = (rule, list(parents))
+            self.stats["kept"] += 1
+
+            # Добавляем в соответствующую очередь с приоритетом
+            if self._is_unit_clause(resolvent):
+                self.unit_queue.appendleft(resolvent)  # Единичные - в начало
+                self._log_step(f"→ Новая единичная клауза, добавляется в приоритетную очередь")
+            else:
+                self.non_unit_queue.append(resolvent)  # Составные - в конец
+        return False
+
+    def _extract_refutation(self, empty_clause: List[Tuple], rule: str, parents: List[List[Tuple]]) -> List[Dict]:
+        """
+        Восстанавливает вывод пустой клаузы: шаги от посылок к ◻ в порядке применения
+        Каждый шаг: {"clause": клауза, "rule": правило вывода, "parents": клаузы-родители}
+        """
+        steps = []
+        visited = set()
+        stack = [(parent, False) for parent in reversed(parents)]
+        while stack:
+            clause, expanded = stack.pop()
+            key = self._clause_to_str(clause)
+            derivation = self.derivations.get(key)
+            if expanded:
+                steps.append({"clause": clause, "rule": derivation[0], "parents": derivation[1]})
+                continue
+            if key in visited or derivation is None:  # Уже учтена или это посылка
+                continue
+            visited.add(key)
+            stack.append((clause, True))
+            stack.extend((parent, False) for parent in reversed(derivation[1]))
+
+        steps.append({"clause": empty_clause, "rule": rule, "parents": parents})
+        return steps
 
     def _remove_tautologies(self, clauses: List[List[Tuple]]) -> List[List[Tuple]]:
         """
@@ -0,0 +1,60 @@
+import time
+
+from modules.formalizer import Formalizer
+from modules.resolution_engine import ResolutionEngine
+
+
+class SpeculativeProver:
+    """
+    Спекулятивное доказательство: движок резолюций получает формулы по мере потоковой генерации
+    формализатора; при раннем противоречии оставшаяся генерация отменяется
+    """
+
+    def __init__(self, formalizer: Formalizer, prover: ResolutionEngine):
+        self.formalizer = formalizer
+        self.prover = prover
+
+    def run(self, natural_language_text: str, on_formula=None) -> dict:
+        """
+        Выполняет формализацию и доказательство одновременно
+        on_formula: необязательный обработчик каждой полученной формулы (например, для GUI)
+        Возвращает формулы, результат, шаги и задержки этапов в мс
+        """
+        started = time.perf_counter()
+        timings = {}
+        formulas = []
+        cancelled = False
+
+        self.prover.start_incremental()
+        stream = self.formalizer.formalize_stream(natural_language_text)
+        try:
+            for formula in stream:
+                if not formulas:
+                    timings["first_formula_ms"] = (time.perf_counter() - started) * 1000
+                formulas.append(formula)
+                if on_formula is not None:
+                    on_formula(formula)
+
+                if self.prover.add_formula(formula):
+                    # Если модель уже закончила ответ, отменять нечего
+                    cancelled = not self.formalizer.stream_finished
+                    if cancelled:
+                        print("⏹️  Противоречие найдено до конца генерации, отменяю формализацию")
+                    break
+        finally:
+            stream.close()
+
+        proved, steps = self.prover.finish_incremental()
+        if not proved and formulas:
+            # Насыщение по мере поступления тратит общий лимит шагов на формулы без отрицания цели
+            # (оно обычно приходит последним), поэтому без противоречия доказываем полный набор заново,
+            # как последовательный путь: спекулятивный режим не должен быть слабее
+            proved, steps = self.prover.prove(formulas)
+        timings["total_ms"] = (time.perf_counter() - started) * 1000
+        return {
+            "formulas": formulas,
+            "proved": proved,
+            "steps": steps,
+            "cancelled": cancelled,
+            "timings": timings
+        }
@@ -0,0 +1,76 @@
+from typing import Dict, List, Tuple
+
+
+class KBOrdering:
+    """
+    Упорядочение Кнута-Бендикса (KBO) для литералов движка резолюций
+    Аргументы литералов плоские: переменные (строчные) и константы
+    """
+
+    def __init__(self, weights: Dict[str, int] = None, precedence: List[str] = None, variable_weight: int = 1):
+        self.weights = weights or {}
+        self.precedence = {symbol: rank for rank, symbol in enumerate(precedence or [])}
+        self.variable_weight = variable_weight
+
+    @staticmethod
+    def is_variable(term: str) -> bool:
+        return term.islower()
+
+    def symbol_weight(self, symbol: str) -> int:
+        return self.weights.get(symbol, 1)
+
+    def weight(self, literal: Tuple) -> int:
+        pred, args, _ = literal
+        return self.symbol_weight(pred) + sum(
+            self.variable_weight if self.is_variable(arg) else self.symbol_weight(arg) for arg in args)
+
+    def _precedence_key(self, symbol: str) -> tuple:
+        # Символы из явного списка precedence упорядочены по нему, остальные — по имени
+        if symbol in self.precedence:
+            return (1, self.precedence[symbol], symbol)
+        return (0, 0, symbol)
+
+    def _symbol_greater(self, s: str, t: str) -> bool:
+        return self._precedence_key(s) > self._precedence_key(t)
+
+    def _variables_dominate(self, args1: List[str], args2: List[str]) -> bool:
+        """Каждая переменная встречается в args1 не реже, чем в args2"""
+        for var in set(a for a in args2 if self.is_variable(a)):
+            if args1.count(var) < args2.count(var):
+                return False
+        return True
+
+    def _term_greater(self, s: str, t: str) -> bool:
+        """
+        s > t в KBO для плоских термов: переменная не больше ничего, константа и переменная несравнимы
+        (иначе порядок не сохраняется при подстановке), константы сравниваются по весу, затем по приоритету
+        """
+        if self.is_variable(s) or self.is_variable(t):
+            return False
+        weight_s, weight_t = self.symbol_weight(s), self.symbol_weight(t)
+        if weight_s != weight_t:
+            return weight_s > weight_t
+        return self._symbol_greater(s, t)
+
+    def greater(self, literal1: Tuple, literal2: Tuple) -> bool:
+        """literal1 > literal2 в KBO; при равных атомах отрицательный литерал больше положительного"""
+        pred1, args1, neg1 = literal1
+        pred2, args2, neg2 = literal2
+
+        if pred1 == pred2 and args1 == args2:
+            return neg1 and not neg2
+
+        if not self._variables_dominate(args1, args2):
+            return False
+
+        weight1, weight2 = self.weight(literal1), self.weight(literal2)
+        if weight1 != weight2:
+            return weight1 > weight2
+        if pred1 != pred2:
+            return self._symbol_greater(pred1, pred2)
+
+        # Решает первая различающаяся пара аргументов; если она несравнима, несравнимы и литералы
+        for a1, a2 in zip(args1, args2):
+            if a1 != a2:
+                return self._term_greater(a1, a2)
+        return False
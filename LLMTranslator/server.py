@@ -0,0 +1,341 @@
+"""
+HTTP-СЕРВИС СИСТЕМЫ ЛОГИЧЕСКОГО ВЫВОДА
+Открывает три модуля для других сервисов: формализация, доказательство, объяснение и полный конвейер
+
+Эндпоинты:
+    POST /formalize  {"text": ...}                        -> {"formulas": [...]}
+    POST /prove      {"formulas": [...]}                  -> {"proved": ..., "steps": [...]}
+    POST /explain    {"steps": [...], "query": ..., "proved": ..., "refutation": [...]} -> {"explanation": ...}
+    POST /pipeline   {"text": ...}                        -> все результаты сразу
+    GET  /health, GET /metrics
+
+Запуск: python server.py [--port 8080] [--backend ollama|openai|replay]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config import SERVER_CONFIG, LLM_BACKEND, RESOLUTION_STRATEGY
+from modules.explainer import Explainer
+from modules.explanation_router import ExplanationRouter
+from modules.formalizer import Formalizer
+from modules.llm_backends import create_backend
+from modules.llm_client import AsyncLLMClient
+from modules.llm_usage import USAGE_TRACKER
+from modules.resolution_engine import ResolutionEngine
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                408: "Request Timeout", 413: "Payload Too Large", 500: "Internal Server Error",
+                503: "Service Unavailable"}
+
+
+def _prove_in_process(formulas: list, max_clauses: int) -> tuple:
+    """
+    Запускает движок резолюций в процессе пула (не блокирует цикл событий)
+    max_clauses ограничивает поиск: иначе одна тяжелая задача надолго занимает процесс пула
+    """
+    prover = ResolutionEngine(verbose=False, max_clauses=max_clauses, **RESOLUTION_STRATEGY)
+    proved, steps = prover.prove(formulas)
+    return proved, steps, prover.refutation
+
+
+class ServiceMetrics:
+    """Счетчики и задержки по эндпоинтам"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.rejected = 0
+        self.endpoints = {}
+
+    def record(self, endpoint: str, latency: float, ok: bool):
+        stats = self.endpoints.setdefault(endpoint, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+        latency_ms = latency * 1000
+        stats["count"] += 1
+        stats["errors"] += 0 if ok else 1
+        stats["total_ms"] += latency_ms
+        stats["max_ms"] = max(stats["max_ms"], latency_ms)
+
+    def snapshot(self) -> dict:
+        endpoints = {}
+        for name, stats in self.endpoints.items():
+            endpoints[name] = {
+                "count": stats["count"],
+                "errors": stats["errors"],
+                "avg_ms": round(stats["total_ms"] / stats["count"], 2) if stats["count"] else 0.0,
+                "max_ms": round(stats["max_ms"], 2)
+            }
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "rejected": self.rejected,
+            "endpoints": endpoints
+        }
+
+
+class ProverService:
+    """
+    Асинхронный HTTP-сервер поверх трех модулей
+    Запросы попадают в ограниченную очередь; при переполнении сервер сразу отвечает 503
+    """
+
+    def __init__(self, config: dict = None, backend_settings: dict = None):
+        self.config = dict(SERVER_CONFIG, **(config or {}))
+        self.backend = create_backend(backend_settings)
+        self.formalizer = Formalizer(backend=self.backend)
+        self.explainer = Explainer(backend=self.backend)
+        self.explanation_router = ExplanationRouter(self.explainer)
+        self.metrics = ServiceMetrics()
+
+        self.llm_client = None
+        self.executor = None
+        self.queue = None
+        self.workers = []
+        self.server = None
+
+        self.routes = {
+            "/formalize": self.handle_formalize,
+            "/prove": self.handle_prove,
+            "/explain": self.handle_explain,
+            "/pipeline": self.handle_pipeline
+        }
+
+    async def start(self):
+        """Запускает пул процессов, обработчики очереди и HTTP-сервер"""
+        self.llm_client = AsyncLLMClient(self.backend,
+                                         max_concurrency=self.config["llm_concurrency"],
+                                         timeout=self.config["llm_timeout"])
+        # spawn, а не fork: процесс пула, запущенный посреди обработки, не должен унаследовать сокеты
+        # открытых соединений, иначе после закрытия клиент не получает конец ответа
+        self.executor = ProcessPoolExecutor(max_workers=self.config["prover_processes"],
+                                            mp_context=multiprocessing.get_context("spawn"))
+        self.queue = asyncio.Queue(maxsize=self.config["queue_size"])
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.config["request_workers"])]
+        self.server = await asyncio.start_server(self._handle_connection, self.config["host"], self.config["port"])
+        print(f"🌐 Сервис запущен на http://{self.config['host']}:{self.port}")
+
+    @property
+    def port(self) -> int:
+        """Фактический порт (полезно при port=0)"""
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Останавливает сервер и освобождает ресурсы"""
+        self.server.close()
+        await self.server.wait_closed()
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _worker(self):
+        """Обработчик очереди запросов"""
+        while True:
+            handler, payload, future = await self.queue.get()
+            try:
+                if not future.cancelled():
+                    future.set_result(await handler(payload))
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+    # === Обработчики эндпоинтов ===
+
+    async def handle_formalize(self, payload: dict) -> dict:
+        text = self._require(payload, "text", str)
+        formulas = await self.formalizer.formalize_async(text, self.llm_client)
+        return {"formulas": formulas}
+
+    async def handle_prove(self, payload: dict) -> dict:
+        formulas = self._require(payload, "formulas", list)
+        loop = asyncio.get_running_loop()
+        proved, steps, refutation = await loop.run_in_executor(self.executor, _prove_in_process, formulas,
+                                                               self.config["prover_max_clauses"])
+        return {"proved": proved, "steps": steps, "refutation": refutation}
+
+    async def handle_explain(self, payload: dict) -> dict:
+        steps = self._require(payload, "steps", list)
+        query = self._require(payload, "query", str)
+        proved = bool(payload.get("proved", False))
+        refutation = self._optional_refutation(payload)
+        explanation = await self.explanation_router.explain_async(steps, query, proved, refutation, self.llm_client)
+        return {"explanation": explanation}
+
+    async def handle_pipeline(self, payload: dict) -> dict:
+        text = self._require(payload, "text", str)
+        result = await self.handle_formalize({"text": text})
+        result.update(await self.handle_prove({"formulas": result["formulas"]}))
+        result.update(await self.handle_explain({"steps": result["steps"], "query": text,
+                                                 "proved": result["proved"], "refutation": result["refutation"]}))
+        return result
+
+    def health(self) -> dict:
+        return {
+            "status": "ok",
+            "llm_backend": self.backend.name,
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "llm_in_flight": self.llm_client.in_flight
+        }
+
+    @staticmethod
+    def _require(payload: dict, key: str, expected_type: type):
+        value = payload.get(key)
+        if not isinstance(value, expected_type):
+            raise ValueError(f"Поле '{key}' обязательно и должно иметь тип {expected_type.__name__}")
+        return value
+
+    @classmethod
+    def _optional_refutation(cls, payload: dict) -> list:
+        """Поле refutation (как в ответе /prove) необязательно, но если есть — проверяется его структура"""
+        refutation = payload.get("refutation")
+        if refutation is None:
+            return None
+        if not isinstance(refutation, list) or not all(
+                isinstance(step, dict) and isinstance(step.get("rule"), str)
+                and cls._is_clause(step.get("clause"))
+                and isinstance(step.get("parents"), list) and all(cls._is_clause(p) for p in step["parents"])
+                for step in refutation):
+            raise ValueError("Поле 'refutation' должно быть списком шагов {clause, rule, parents}, как в ответе /prove")
+        return refutation
+
+    @staticmethod
+    def _is_clause(clause) -> bool:
+        """Клауза: список литералов [предикат, [аргументы], отрицание]"""
+        return isinstance(clause, list) and all(
+            isinstance(literal, (list, tuple)) and len(literal) == 3
+            and isinstance(literal[0], str) and isinstance(literal[2], bool)
+            and isinstance(literal[1], list) and all(isinstance(arg, str) for arg in literal[1])
+            for literal in clause)
+
+    # === HTTP ===
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Чтение ограничено по времени и размеру: медленный или огромный запрос не держит соединение и память
+        timeout = self.config["read_timeout"]
+        try:
+            method, path, content_length = await asyncio.wait_for(self._read_head(reader), timeout)
+            if content_length > self.config["max_body_bytes"]:
+                status, response = 413, {"error": f"Тело запроса больше {self.config['max_body_bytes']} байт"}
+            else:
+                body = await asyncio.wait_for(reader.readexactly(content_length), timeout) if content_length else b""
+                status, response = await self._dispatch(method, path, body)
+        except asyncio.TimeoutError:
+            status, response = 408, {"error": "Запрос не получен вовремя"}
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            status, response = 400, {"error": str(e)}
+
+        data = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(data)}",
+            "Connection: close"
+        ]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        try:
+            writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + data)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> tuple:
+        """Читает строку запроса и заголовки; возвращает (метод, путь, длина тела)"""
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) < 2:
+            raise ValueError("Некорректная строка запроса")
+        method, path = request_line[0].upper(), request_line[1].split("?")[0]
+
+        content_length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                content_length = int(value.strip())
+                if content_length < 0:
+                    raise ValueError("Некорректный Content-Length")
+        return method, path, content_length
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> tuple:
+        if path == "/health":
+            return 200, self.health()
+        if path == "/metrics":
+            return 200, dict(self.metrics.snapshot(), llm_usage=USAGE_TRACKER.summary(),
+                             explanations=self.explanation_router.stats(), **self.health())
+
+        handler = self.routes.get(path)
+        if handler is None:
+            return 404, {"error": f"Неизвестный путь {path}"}
+        if method != "POST":
+            return 405, {"error": "Ожидается POST"}
+
+        try:
+            payload = json.loads(body.decode("utf-8") or "{}")
+        except json.JSONDecodeError as e:
+            return 400, {"error": f"Некорректный JSON: {e}"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "Тело запроса должно быть JSON-объектом"}
+
+        # Backpressure: не копим бесконечную очередь, а сразу отказываем
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((handler, payload, future))
+        except asyncio.QueueFull:
+            self.metrics.rejected += 1
+            return 503, {"error": "Очередь переполнена, повторите запрос позже"}
+
+        started = time.perf_counter()
+        try:
+            result = await future
+        except ValueError as e:
+            self.metrics.record(path, time.perf_counter() - started, ok=False)
+            return 400, {"error": str(e)}
+        except Exception as e:
+            self.metrics.record(path, time.perf_counter() - started, ok=False)
+            return 500, {"error": str(e)}
+
+        self.metrics.record(path, time.perf_counter() - started, ok=True)
+        return 200, result
+
+
+async def serve(config: dict, backend_settings: dict):
+    service = ProverService(config, backend_settings)
+    await service.start()
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP-сервис системы логического вывода")
+    parser.add_argument("--host", default=SERVER_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=SERVER_CONFIG["port"])
+    parser.add_argument("--backend", default=LLM_BACKEND["type"], help="ollama | openai | record | replay")
+    parser.add_argument("--ollama-host", default=LLM_BACKEND["ollama_host"],
+                        help="Адрес Ollama или stub_llm_server.py")
+    parser.add_argument("--openai-base-url", default=LLM_BACKEND["openai_base_url"])
+    parser.add_argument("--replay-file", default=LLM_BACKEND["replay_file"])
+    args = parser.parse_args()
+
+    backend_settings = {
+        "type": args.backend,
+        "ollama_host": args.ollama_host,
+        "openai_base_url": args.openai_base_url,
+        "replay_file": args.replay_file
+    }
+    try:
+        asyncio.run(serve({"host": args.host, "port": args.port}, backend_settings))
+    except KeyboardInterrupt:
+        print("🛑 Сервис остановлен")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+ЗАГЛУШКА LLM-СЕРВЕРА ДЛЯ ЛОКАЛЬНОГО ТЕСТИРОВАНИЯ
+Реализует POST /api/chat (Ollama) и POST /v1/chat/completions (OpenAI) и отвечает заранее заданными текстами
+
+Поддерживает потоковые ответы ("stream": true) с задержкой на токен
+
+Запуск: python stub_llm_server.py [--port 11500] [--latency 0.2] [--token-latency 0.02] [--chatty]
+Затем:  python server.py --backend ollama --ollama-host http://127.0.0.1:11500
+   или: python server.py --backend openai --openai-base-url http://127.0.0.1:11500/v1
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Ответы формализатора по ключевым словам входного текста
+FORMALIZER_ANSWERS = [
+    (["сократ"], "Человек(Сократ), ∀x (Человек(x) → Смертен(x)), ¬Смертен(Сократ)"),
+    (["мурка"], "∀x (Кошка(x) → Млекопитающее(x)), ∀x (Млекопитающее(x) → Позвоночное(x)), "
+                "Кошка(Мурка), ¬Позвоночное(Мурка)"),
+    (["пингвин"], "∀x (Птица(x) → Летает(x)), Птица(Пингвин), ¬Летает(Пингвин)"),
+    (["дожд"], "Дождь → МокраяУлица, МокраяУлица, ¬Дождь"),
+]
+DEFAULT_FORMALIZER_ANSWER = "P(a), ∀x (P(x) → Q(x)), ¬Q(a)"
+
+# Хвост "болтливой" модели после формул (--chatty): его генерацию отменяет спекулятивный режим
+CHATTY_TAIL = (
+    "\nОбъяснение: первая формула описывает факт, вторая — общее правило, "
+    "последняя — отрицание доказываемого утверждения."
+)
+
+EXPLAINER_ANSWER = (
+    "Давайте разберем доказательство по шагам. Из общего правила и известного факта следует вывод, "
+    "который противоречит предположению, добавленному для доказательства от противного. "
+    "Следовательно, предположение было ложным, значит, исходное утверждение доказано."
+)
+
+
+def build_answer(messages: list, chatty: bool = False) -> str:
+    """Выбирает ответ по содержимому сообщений"""
+    user = " ".join(m["content"] for m in messages if m.get("role") == "user").lower()
+
+    if "формулы логики предикатов" in user:
+        answer = DEFAULT_FORMALIZER_ANSWER
+        for keywords, candidate in FORMALIZER_ANSWERS:
+            if any(word in user for word in keywords):
+                answer = candidate
+                break
+        return answer + CHATTY_TAIL if chatty else answer
+    return EXPLAINER_ANSWER
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    token_latency = 0.0
+    chatty = False
+
+    def do_POST(self):
+        if self.path not in ("/api/chat", "/v1/chat/completions"):
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length).decode("utf-8"))
+        messages = request.get("messages", [])
+
+        time.sleep(self.latency)
+        answer = build_answer(messages, self.chatty)
+        prompt_chars = sum(len(m.get("content", "")) for m in messages)
+
+        if request.get("stream"):
+            include_usage = (request.get("stream_options") or {}).get("include_usage", False)
+            self._stream(answer, request.get("model", "stub"), prompt_chars // 4, include_usage)
+            return
+
+        time.sleep(self.token_latency * (len(answer) // 4))
+
+        message = {"role": "assistant", "content": answer}
+        if self.path == "/api/chat":
+            response = {
+                "model": request.get("model", "stub"),
+                "message": message,
+                "done": True,
+                "prompt_eval_count": prompt_chars // 4,
+                "eval_count": len(answer) // 4
+            }
+        else:
+            response = {
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_chars // 4, "completion_tokens": len(answer) // 4}
+            }
+        data = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, answer: str, model: str, prompt_tokens: int, include_usage: bool):
+        """Отдает ответ по ~4 символа: NDJSON для Ollama, server-sent events для OpenAI"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson" if self.path == "/api/chat" else "text/event-stream")
+        self.end_headers()
+
+        try:
+            for i in range(0, len(answer), 4):
+                time.sleep(self.token_latency)
+                piece = answer[i:i + 4]
+                if self.path == "/api/chat":
+                    chunk = {"model": model, "message": {"role": "assistant", "content": piece}, "done": False}
+                    line = json.dumps(chunk, ensure_ascii=False) + "\n"
+                else:
+                    chunk = {"model": model, "choices": [{"index": 0, "delta": {"content": piece}}]}
+                    line = f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                self.wfile.write(line.encode("utf-8"))
+                self.wfile.flush()
+
+            if self.path == "/api/chat":
+                done = {"model": model, "message": {"role": "assistant", "content": ""}, "done": True,
+                        "prompt_eval_count": prompt_tokens, "eval_count": len(answer) // 4}
+                self.wfile.write((json.dumps(done) + "\n").encode("utf-8"))
+            else:
+                if include_usage:
+                    usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(answer) // 4}
+                    self.wfile.write(f"data: {json.dumps({'model': model, 'choices': [], 'usage': usage})}\n\n"
+                                     .encode("utf-8"))
+                self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Клиент прервал генерацию
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Заглушка LLM-сервера (Ollama и OpenAI API)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", type=float, default=0.0, help="Искусственная задержка ответа, с")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Задержка на токен (~4 символа), с")
+    parser.add_argument("--chatty", action="store_true", help="Добавлять пояснения после формул")
+    args = parser.parse_args()
+
+    StubLLMHandler.latency = args.latency
+    StubLLMHandler.token_latency = args.token_latency
+    StubLLMHandler.chatty = args.chatty
+    server = ThreadingHTTPServer((args.host, args.port), StubLLMHandler)
+    print(f"🧪 Заглушка LLM запущена на http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("🛑 Заглушка остановлена")
+
+
+if __name__ == "__main__":
+    main()